@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+オフライン言語識別の評価スクリプト
+同梱のチャットサンプル（twitchTransFreeNeo/data/langid/eval_chat.tsv）で
+正解率・しきい値ごとのカバー率と正解率・1メッセージあたりの処理時間を表示します
+プロファイルのない言語のサンプルは、しきい値以上で誤判定した件数も表示します
+
+使い方:
+    python evaluate_langid.py [--file サンプル.tsv] [--threshold 0.8] [--verbose]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+
+# Windows環境でのUTF-8出力を確保
+if sys.platform == "win32":
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+from twitchTransFreeNeo.core.langid import LanguageIdentifier, DATA_DIR
+
+
+def load_samples(path):
+    """「言語コード<TAB>テキスト」形式のサンプルを読み込む"""
+    samples = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line or line.startswith('#'):
+                continue
+            lang, text = line.split('\t', 1)
+            samples.append((lang, text))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="オフライン言語識別の評価")
+    parser.add_argument('--file', default=os.path.join(DATA_DIR, 'eval_chat.tsv'), help="評価サンプル（TSV）")
+    parser.add_argument('--threshold', type=float, default=0.8, help="リモート検出に回す確信度のしきい値")
+    parser.add_argument('--verbose', action='store_true', help="誤判定をすべて表示")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    identifier = LanguageIdentifier()
+    load_ms = (time.perf_counter() - start) * 1000
+
+    samples = load_samples(args.file)
+    start = time.perf_counter()
+    results = [(lang, text) + identifier.identify(text) for lang, text in samples]
+    per_message_us = (time.perf_counter() - start) / max(len(samples), 1) * 1_000_000
+
+    correct = sum(1 for lang, _, predicted, _ in results if predicted == lang)
+    print(f"サンプル数: {len(results)}  プロファイル構築: {load_ms:.0f}ms  識別: {per_message_us:.0f}µs/件")
+    print(f"正解率: {correct / len(results):.1%} ({correct}/{len(results)})")
+
+    print("\nしきい値ごとのカバー率と正解率（しきい値未満はリモート検出に回る）")
+    for threshold in sorted({0.5, 0.6, 0.7, 0.8, 0.9, args.threshold}):
+        confident = [r for r in results if r[3] >= threshold]
+        accuracy = sum(1 for r in confident if r[0] == r[2]) / len(confident) if confident else 0.0
+        marker = " ←" if threshold == args.threshold else ""
+        print(f"  {threshold:.2f}: カバー率 {len(confident) / len(results):.1%}  正解率 {accuracy:.1%}{marker}")
+
+    # プロファイルのない言語は正解できないため、しきい値未満（リモート検出に回る）なら問題ない
+    supported = set(identifier.supported_languages)
+    unprofiled = [r for r in results if r[0] not in supported]
+    if unprofiled:
+        leaked = sum(1 for r in unprofiled if r[3] >= args.threshold)
+        print(f"\nプロファイルのない言語: {len(unprofiled)}件中 {leaked}件がしきい値以上（誤った言語として扱われる）")
+
+    print("\n言語別の正解率")
+    by_lang = defaultdict(lambda: [0, 0])
+    for lang, _, predicted, _ in results:
+        by_lang[lang][0] += predicted == lang
+        by_lang[lang][1] += 1
+    for lang, (ok, total) in sorted(by_lang.items()):
+        print(f"  {lang:6s} {ok}/{total}")
+
+    misses = [r for r in results if r[0] != r[2]]
+    if misses and args.verbose:
+        print("\n誤判定")
+        for lang, text, predicted, confidence in misses:
+            print(f"  {lang} → {predicted} ({confidence:.2f}): {text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+翻訳リクエストのマイクロバッチ
+短時間に届いた翻訳を (翻訳先言語, 翻訳元言語) ごとにまとめ、1回のAPI呼び出しで翻訳する
+"""
+
+import asyncio
+from typing import Optional, List, Dict, Tuple, Callable, Awaitable
+
+BatchKey = Tuple[str, str]
+BatchFunc = Callable[[List[str], str, str], Awaitable[List[Optional[str]]]]
+
+
+class TranslationBatcher:
+    """翻訳待ちのメッセージを数ミリ秒集めてまとめて翻訳する
+
+    window_ms経過するか、max_items件に達した時点でバッチを送出する。
+    同じバッチ内の同一テキストは1件として翻訳し、結果を待機中の全員に返す。
+    イベントループに紐づくため、翻訳サービスのループからのみ使用する。
+    """
+
+    def __init__(self, translate_batch: BatchFunc, window_ms: int = 20, max_items: int = 16):
+        self.translate_batch = translate_batch
+        self.window = window_ms / 1000
+        self.max_items = max_items
+        self._pending: Dict[BatchKey, Dict[str, List[asyncio.Future]]] = {}
+        self._timers: Dict[BatchKey, asyncio.TimerHandle] = {}
+        self.batches_sent = 0
+        self.items_batched = 0
+
+    async def translate(self, text: str, target_lang: str, source_lang: str,
+                        immediate: bool = False) -> Optional[str]:
+        """バッチに追加して翻訳結果を待つ
+
+        Args:
+            immediate: Trueならまとめずにすぐ送る（1リクエスト1テキストのエンジン用）
+        """
+        if immediate or self.window <= 0 or self.max_items <= 1:
+            return (await self.translate_batch([text], target_lang, source_lang))[0]
+
+        loop = asyncio.get_running_loop()
+        key = (target_lang, source_lang)
+        future = loop.create_future()
+        batch = self._pending.setdefault(key, {})
+        batch.setdefault(text, []).append(future)
+
+        if len(batch) >= self.max_items:
+            self._dispatch(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.window, self._dispatch, key)
+        return await future
+
+    def _dispatch(self, key: BatchKey):
+        """待機中のバッチを送出"""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if batch:
+            asyncio.get_running_loop().create_task(self._run(key, batch))
+
+    async def _run(self, key: BatchKey, batch: Dict[str, List[asyncio.Future]]):
+        """バッチを翻訳し、結果を待機中のコルーチンへ返す"""
+        texts = list(batch)
+        self.batches_sent += 1
+        self.items_batched += len(texts)
+        try:
+            results = await self.translate_batch(texts, *key)
+        except Exception as e:
+            print(f"バッチ翻訳エラー: {e}")
+            results = [None] * len(texts)
+        if len(results) != len(texts):
+            print(f"バッチ翻訳エラー: 結果の件数が一致しません ({len(results)}/{len(texts)})")
+            results = [None] * len(texts)
+
+        for text, result in zip(texts, results):
+            for future in batch[text]:
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self) -> Dict[str, float]:
+        """統計情報"""
+        return {
+            'batches_sent': self.batches_sent,
+            'items_batched': self.items_batched,
+            'average_batch_size': round(self.items_batched / self.batches_sent, 2) if self.batches_sent else 0.0,
+        }
@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+翻訳キャッシュ用のインメモリ構造
+SQLiteに問い合わせる前段で使う、件数・バイト数で上限を持つLRUキャッシュと、
+翻訳不要と判定したメッセージを覚えておくネガティブキャッシュ、
+表記ゆれを吸収するキャッシュキーの正規化
+"""
+
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple, Union
+
+
+def normalize_text(text: str) -> str:
+    """キャッシュキー用にテキストを正規化"""
+    return " ".join(text.split())
+
+
+class KeyNormalizer:
+    """翻訳キャッシュのキーに使う正規化（処理ごとに有効・無効を設定できる）
+
+    nfkc: 全角英数字・半角カナなどの表記ゆれを統一（"ｌｏｌ" → "lol"）
+    casefold: 大文字小文字を区別しない（大文字小文字のない文字種には影響しない）
+    collapse_repeats: 数字以外の同じ文字がこの回数以上続く部分を1文字にまとめる
+        （"lolll" → "lol"、0で無効）
+    trim_punctuation: 前後の句読点を取り除く（"lol!!!" → "lol"）
+    空白の連続は常に1つにまとめる。正規化で空になる場合（句読点のみなど）は
+    空白の正規化だけを適用する。
+    """
+
+    def __init__(self, nfkc: bool = True, casefold: bool = True, collapse_repeats: int = 3,
+                 trim_punctuation: bool = True):
+        self.nfkc = nfkc
+        self.casefold = casefold
+        self.collapse_repeats = max(0, collapse_repeats)
+        self.trim_punctuation = trim_punctuation
+        self._repeat_re = (re.compile(r"([^\d\s])\1{%d,}" % (self.collapse_repeats - 1))
+                           if self.collapse_repeats >= 2 else None)
+
+    @property
+    def signature(self) -> str:
+        """設定を表す文字列（DBに記録し、設定が変わったらキーを再計算する）"""
+        parts = []
+        if self.nfkc:
+            parts.append("nfkc")
+        if self.casefold:
+            parts.append("casefold")
+        if self._repeat_re is not None:
+            parts.append(f"repeat{self.collapse_repeats}")
+        if self.trim_punctuation:
+            parts.append("punct")
+        return ",".join(parts)
+
+    @classmethod
+    def from_signature(cls, signature: str) -> "KeyNormalizer":
+        """signatureから同じ設定の正規化を作る"""
+        parts = set(filter(None, signature.split(",")))
+        repeats = next((int(part[len("repeat"):]) for part in parts if part.startswith("repeat")), 0)
+        return cls(nfkc="nfkc" in parts, casefold="casefold" in parts, collapse_repeats=repeats,
+                   trim_punctuation="punct" in parts)
+
+    def __call__(self, text: str) -> str:
+        base = normalize_text(text)
+        key = base
+        if self.nfkc:
+            key = normalize_text(unicodedata.normalize("NFKC", key))
+        if self.casefold:
+            key = key.casefold()
+        if self._repeat_re is not None:
+            key = self._repeat_re.sub(r"\1", key)
+        if self.trim_punctuation:
+            key = self._trim(key)
+        return key or base
+
+    @staticmethod
+    def _trim(text: str) -> str:
+        """前後の句読点と空白を取り除く"""
+        start, end = 0, len(text)
+        while start < end and (text[start].isspace() or unicodedata.category(text[start])[0] == "P"):
+            start += 1
+        while end > start and (text[end - 1].isspace() or unicodedata.category(text[end - 1])[0] == "P"):
+            end -= 1
+        return text[start:end]
+
+
+def cache_key_hash(normalized_text: str, target_lang: str) -> int:
+    """(正規化テキスト, 翻訳先言語) の64bitハッシュ（SQLiteのINTEGERに収まる符号付き値）"""
+    digest = hashlib.blake2b(
+        f"{target_lang}\x00{normalized_text}".encode('utf-8'), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+class LRUCache:
+    """件数・バイト数で上限を持つLRUキャッシュ（スレッドセーフ）
+
+    参照・更新は翻訳サービスのループからのみ行う。統計（stats）は他のスレッドから
+    読まれることがあるため、操作はすべてロック内で行う。
+    """
+
+    # エントリごとの管理コスト（OrderedDictのノード・タプル等）の概算
+    ENTRY_OVERHEAD = 100
+
+    def __init__(self, max_entries: int = 5000, max_bytes: int = 0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes  # 0 = バイト数制限なし
+        self._data: "OrderedDict[Tuple[str, str], Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _entry_size(key: Tuple[str, str], value: Union[str, Tuple[str, ...]]) -> int:
+        """エントリのおおよそのサイズ（バイト、値は文字列または文字列のタプル）"""
+        values = (value,) if isinstance(value, str) else value
+        return (len(key[0].encode('utf-8')) + len(key[1]) + sum(len(v.encode('utf-8')) for v in values)
+                + LRUCache.ENTRY_OVERHEAD)
+
+    def get(self, key: Tuple[str, str]) -> Optional[Union[str, Tuple[str, ...]]]:
+        """値を取得（ヒット時は最近使用に移動）"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple[str, str], value: Union[str, Tuple[str, ...]]):
+        """値を登録し、上限を超えた分を古い順に追い出す"""
+        if self.max_entries <= 0:
+            return
+        size = self._entry_size(key, value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._data[key] = (value, size)
+            self.current_bytes += size
+            while self._data and (
+                len(self._data) > self.max_entries
+                or (self.max_bytes and self.current_bytes > self.max_bytes)
+            ):
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def discard(self, key: Tuple[str, str]):
+        """エントリを削除"""
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+
+    def clear(self):
+        """全エントリを削除"""
+        with self._lock:
+            self._data.clear()
+            self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """サイズ調整用の統計情報"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'bytes': self.current_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class NegativeCache:
+    """翻訳不要と判定したメッセージ（テキスト → スキップ理由）のキャッシュ
+
+    同じ言語・無視言語・空の翻訳結果など、繰り返し届いても毎回言語検出の
+    通信が無駄になるメッセージを記録する。判定は設定に依存するため、
+    エントリはTTLで失効し、設定変更時にはclear()で破棄する。
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text: str) -> Optional[str]:
+        """スキップ理由を取得（未登録・失効済みならNone）"""
+        key = normalize_text(text)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, text: str, reason: str):
+        """スキップ理由を登録し、上限を超えた分を古い順に追い出す"""
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        key = normalize_text(text)
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (time.monotonic() + self.ttl_seconds, reason)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """全エントリを削除"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """統計情報"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -22,13 +22,11 @@ except ImportError:
         return []
 
 try:
-    from .translator import TranslationEngine, LanguageDetector
-    from .database import TranslationDatabase
-    from .tts import TTSEngine
+    from .translation_service import TranslationService
+    from .scripts import classify
 except ImportError:
-    from twitchTransFreeNeo.core.translator import TranslationEngine, LanguageDetector
-    from twitchTransFreeNeo.core.database import TranslationDatabase
-    from twitchTransFreeNeo.core.tts import TTSEngine
+    from twitchTransFreeNeo.core.translation_service import TranslationService
+    from twitchTransFreeNeo.core.scripts import classify
 
 class ChatMessage:
     """チャットメッセージクラス"""
@@ -142,10 +140,8 @@ if TWITCHIO_AVAILABLE:
             self.config = config
             self.message_callback = message_callback
             self.processor = MessageProcessor(config)
-            self.translator = TranslationEngine(config)
-            self.language_detector = LanguageDetector(config)
-            self.database = TranslationDatabase()
-            self.tts_engine = TTSEngine(config)
+            # 翻訳キャッシュ・翻訳エンジン・TTSはYouTubeモニターと共有
+            self.service = TranslationService.acquire(config)
             self.is_running = False
         
             # 表示のみモードの場合はダミートークンを使用
@@ -180,6 +176,7 @@ if TWITCHIO_AVAILABLE:
                 print(f"TwitchChatBot初期化エラー: {type(e).__name__}: {e}")
                 import traceback
                 traceback.print_exc()
+                self.service.release()
                 raise
     
         async def event_ready(self):
@@ -188,8 +185,6 @@ if TWITCHIO_AVAILABLE:
             print(f"[INFO] ユーザーID: {self.user_id}")
             print(f"[INFO] 接続チャンネル: {list(self.connected_channels)}")
             self.is_running = True
-            # TTSエンジンを開始
-            self.tts_engine.start()
     
         async def event_channel_joined(self, channel):
             """チャンネル参加時"""
@@ -255,46 +250,23 @@ if TWITCHIO_AVAILABLE:
             if not cleaned_content:
                 return
             
-            # 言語指定確認
-            target_lang_override, text_to_translate = self.language_detector.extract_target_language_from_text(cleaned_content)
-            
-            # 言語検出
-            detected_lang = await self.translator.detect_language(text_to_translate or cleaned_content)
-            
-            if not detected_lang:
+            # 言語検出・キャッシュ参照・翻訳（共有の翻訳サービスで実行）
+            service = self.service
+            if not service:
                 return
-            
-            # 無視言語チェック
-            if self.language_detector.should_ignore_language(detected_lang):
+            # 文字種の分類は1メッセージにつき1回だけ行い、母語判定と翻訳で共有する
+            histogram = classify(cleaned_content)
+            # 明らかに母語で翻訳対象外のメッセージは通信せずに打ち切る
+            if service.should_skip_locally(cleaned_content, histogram):
                 return
+            result = await service.submit(service.translate_message(cleaned_content, histogram))
             
-            # 翻訳先言語決定
-            if target_lang_override:
-                target_lang = target_lang_override
-                final_text = text_to_translate
-            else:
-                target_lang = self.language_detector.determine_target_language(detected_lang, cleaned_content)
-                final_text = cleaned_content
-            
-            # 同じ言語なら翻訳不要（pt と pt-BR などの地域バリアントも同一扱い）
-            if LanguageDetector.langs_match(detected_lang, target_lang):
+            if not result:
                 return
             
-            # データベースから既訳語チェック
-            cached_translation = await self.database.get_translation(final_text, target_lang)
-            
-            if cached_translation:
-                translated_text = cached_translation
-            else:
-                # 翻訳実行
-                translated_text = await self.translator.translate_text(final_text, target_lang, detected_lang)
-                
-                if translated_text:
-                    # データベースに保存
-                    await self.database.save_translation(final_text, translated_text, target_lang)
-            
-            if not translated_text:
-                return
+            detected_lang = result.detected_lang
+            target_lang = result.target_lang
+            translated_text = result.translation
             
             # 翻訳後も削除単語除去
             for word in self.processor.delete_words:
@@ -346,6 +318,10 @@ if TWITCHIO_AVAILABLE:
     
         def _add_tts_messages(self, chat_message: ChatMessage):
             """TTS読み上げメッセージを追加"""
+            service = self.service
+            if not service:
+                return
+
             # TTSが無効の場合は何もしない
             if not self.config.get("tts_enabled", False):
                 if self.config.get("debug", False):
@@ -369,7 +345,7 @@ if TWITCHIO_AVAILABLE:
                 if tts_text:
                     if self.config.get("debug", False):
                         print(f"TTS: Adding input text to queue: {tts_text[:50]}...")
-                    self.tts_engine.put(tts_text, chat_message.lang)
+                    service.tts_engine.put(tts_text, chat_message.lang)
                 elif self.config.get("debug", False):
                     print("TTS: No input text generated")
             
@@ -381,7 +357,7 @@ if TWITCHIO_AVAILABLE:
                 if tts_text:
                     if self.config.get("debug", False):
                         print(f"TTS: Adding output text to queue: {tts_text[:50]}...")
-                    self.tts_engine.put(tts_text, chat_message.target_lang)
+                    service.tts_engine.put(tts_text, chat_message.target_lang)
                 elif self.config.get("debug", False):
                     print("TTS: No output text generated")
     
@@ -441,9 +417,10 @@ if TWITCHIO_AVAILABLE:
             """ボット停止"""
             self.is_running = False
 
-            # TTSエンジンを停止
-            if hasattr(self, 'tts_engine'):
-                self.tts_engine.stop()
+            # 共有翻訳サービスを手放す（書き込み待ちの翻訳を反映、最後の利用者ならTTSも停止）
+            if self.service:
+                self.service.release()
+                self.service = None
 
             # イベントループが実行中の場合のみ非同期クローズを試行
             try:
@@ -485,9 +462,7 @@ class ChatMonitor:
             print(f"Twitchチャンネル: {self.config.get('twitch_channel')}")
             print(f"表示のみモード: {self.config.get('view_only_mode')}")
 
-            self.bot = TwitchChatBot(self.config, self.message_callback)
-
-            # 設定検証
+            # 設定検証（ボット生成前に行い、共有翻訳サービスを無駄に確保しない）
             if not self.config.get("twitch_channel"):
                 return False, "Twitchチャンネル名が設定されていません"
 
@@ -495,6 +470,8 @@ class ChatMonitor:
             if not self.config.get("view_only_mode", False) and not self.config.get("trans_oauth"):
                 return False, "OAuthトークンが設定されていません。設定画面で入力してください。"
 
+            self.bot = TwitchChatBot(self.config, self.message_callback)
+
             # 非同期でボット起動（v0.2.0_Betaと同じシンプルな方式に戻す）
             asyncio.create_task(self.bot.start())
             self.is_running = True
@@ -534,8 +511,6 @@ class ChatMonitor:
         if self.bot:
             self.bot.config.update(new_config)
             self.bot.processor = MessageProcessor(new_config)
-            self.bot.translator = TranslationEngine(new_config)
-            self.bot.language_detector = LanguageDetector(new_config)
-            # TTS設定も更新
-            if hasattr(self.bot, 'tts_engine'):
-                self.bot.tts_engine.update_config(new_config)
\ No newline at end of file
+            # 翻訳エンジン・TTS設定は共有サービス側で更新
+            if self.bot.service:
+                self.bot.service.update_config(new_config)
\ No newline at end of file
@@ -1,19 +1,124 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import asyncio
+import gzip
+import json
 import sqlite3
+import threading
 import aiosqlite
 import os
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Callable
+
+try:
+    from .cache import LRUCache, KeyNormalizer, normalize_text, cache_key_hash
+    from .fuzzy import FuzzyMatcher
+except ImportError:
+    from twitchTransFreeNeo.core.cache import LRUCache, KeyNormalizer, normalize_text, cache_key_hash
+    from twitchTransFreeNeo.core.fuzzy import FuzzyMatcher
 
 class TranslationDatabase:
-    """翻訳データベース管理クラス"""
+    """翻訳データベース管理クラス（インメモリLRU + SQLite、書き込みはまとめて反映）"""
 
     MAX_SIZE = 52428800  # 50MB
+    SCHEMA_VERSION = 6
+
+    # サイズ超過時の退避処理設定
+    EVICTION_TARGET_RATIO = 0.8  # MAX_SIZEのこの割合まで削減する
+    EVICTION_CHUNK_ROWS = 500  # 1トランザクションで削除する行数
+    EVICTION_VACUUM_PAGES = 256  # 1チャンクごとに解放するページ数
+    EVICTION_PAUSE = 0.05  # チャンク間の待機（秒）
+    CLEANUP_CHUNK_ROWS = 500  # 期間指定クリーンアップで1トランザクションに削除する行数
+    FUZZY_BACKFILL_ROWS = 500  # あいまい検索の索引に1トランザクションで登録する行数
+    FUZZY_MAX_CANDIDATES = 20  # あいまい検索で類似度を確認する候補の上限
+
+    # コネクションごとのPRAGMA設定
+    CACHE_SIZE_KB = 8192  # ページキャッシュ 8MB
+    MMAP_SIZE = 67108864  # メモリマップ 64MB
+    BUSY_TIMEOUT_MS = 5000
+
+    UPSERT_SQL = '''INSERT INTO translations
+                     (key_hash, message, target_lang, translation, engine, last_used)
+                     VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                     ON CONFLICT(key_hash) DO UPDATE SET
+                         message = excluded.message,
+                         target_lang = excluded.target_lang,
+                         translation = excluded.translation,
+                         engine = excluded.engine,
+                         last_used = excluded.last_used'''
+    # 翻訳パック（1行目がヘッダー、以降1行1翻訳のgzip圧縮JSONL）
+    PACK_FORMAT = "ttfn-translation-pack"
+    PACK_VERSION = 1
+    PACK_IMPORT_SQL = '''INSERT INTO translations
+                          (key_hash, message, target_lang, translation, hit_count)
+                          VALUES (?, ?, ?, ?, ?)
+                          ON CONFLICT(key_hash) DO NOTHING'''
+    PACK_OVERWRITE_SQL = '''INSERT INTO translations
+                             (key_hash, message, target_lang, translation, hit_count)
+                             VALUES (?, ?, ?, ?, ?)
+                             ON CONFLICT(key_hash) DO UPDATE SET
+                                 message = excluded.message,
+                                 target_lang = excluded.target_lang,
+                                 translation = excluded.translation,
+                                 engine = NULL'''
+
+    FUZZY_INDEX_SQL = '''INSERT OR IGNORE INTO fuzzy_index (band_hash, key_hash) VALUES (?, ?)'''
+    FUZZY_BACKFILL_SQL = "INSERT OR REPLACE INTO cache_meta (key, value) VALUES ('fuzzy_backfill', ?)"
 
-    def __init__(self, db_path: str = "translations.db"):
+    HIT_SQL = '''UPDATE translations
+                  SET hit_count = hit_count + ?, last_used = CURRENT_TIMESTAMP
+                  WHERE key_hash = ?'''
+
+    def __init__(self, db_path: str = "translations.db",
+                 cache_max_entries: int = 5000, cache_max_bytes: int = 4194304,
+                 flush_interval_ms: int = 500, flush_max_rows: int = 50,
+                 key_normalizer: Optional[KeyNormalizer] = None,
+                 fuzzy_matcher: Optional[FuzzyMatcher] = None):
+        """
+        Args:
+            key_normalizer: キャッシュキーの正規化（省略時はDBに記録された設定を使う）
+            fuzzy_matcher: あいまい検索の設定（省略時は検索も索引の更新も行わない）
+        """
         self.db_path = db_path
+        self.key_normalizer = key_normalizer
+        self.fuzzy_matcher = fuzzy_matcher or FuzzyMatcher(enabled=False)
+        # インメモリLRUの値は (翻訳, 空白のみ正規化した原文)
+        self.memory_cache = LRUCache(cache_max_entries, cache_max_bytes)
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._reader: Optional[aiosqlite.Connection] = None
+
+        # 書き込み待ちバッファ（正規化キー → (message, target_lang, translation)）
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_max_rows = max(1, flush_max_rows)
+        self._pending: Dict[Tuple[str, str], Tuple[str, str, str, Optional[str]]] = {}
+        self._flushing: List[Dict[Tuple[str, str], Tuple[str, str, str, Optional[str]]]] = []
+        self._pending_lock = threading.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+        # キャッシュヒットの記録（正規化キー → ヒット回数）
+        self._pending_hits: Dict[Tuple[str, str], int] = {}
+        self._eviction_task: Optional[asyncio.Task] = None
+
+        # キーの正規化による効果の集計
+        self.lookups = 0
+        self.hits = 0
+        self.normalized_hits = 0  # 原文の表記が保存済みの翻訳と異なるのにヒットした件数
+        self.saves = 0
+        self.normalized_saves = 0  # 正規化でキーが原文と異なる形になった保存件数
+
+        # あいまい検索の集計と、索引の未登録行の位置（''=先頭から、None=登録済み）
+        self.fuzzy_lookups = 0
+        self.fuzzy_candidates = 0
+        self.fuzzy_hits = 0
+        self._fuzzy_backfill: Optional[str] = None
+
+        # キーの正規化設定が変わった場合の再計算（rekey()でバックグラウンド実行する）
+        self._rekey_pending = False
+        self._rekey_future: Optional[asyncio.Future] = None
+
         self._init_database()
+        if self.key_normalizer is None:
+            self.key_normalizer = KeyNormalizer()
 
     def _init_database(self):
         """データベース初期化（同期的に実行 - __init__から呼ばれるため）"""
@@ -21,149 +126,1072 @@ class TranslationDatabase:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
 
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS translations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    message TEXT NOT NULL,
-                    target_lang TEXT NOT NULL,
-                    translation TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(message, target_lang)
-                )
-            ''')
+            # 新規ファイルではテーブル作成前に設定する必要がある
+            cursor.execute('PRAGMA auto_vacuum=INCREMENTAL')
 
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_message_lang
-                ON translations(message, target_lang)
-            ''')
+            # WALはデータベースファイルに永続化されるため初期化時に1度だけ設定
+            cursor.execute('PRAGMA journal_mode=WAL')
+
+            exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'translations'"
+            ).fetchone()
+            if exists:
+                self._migrate(conn)
+            else:
+                self._create_translations_table(conn, 'translations')
+                self._create_stats_table(conn)
+                self._create_meta_table(conn)
+                signature = (self.key_normalizer or KeyNormalizer()).signature
+                cursor.execute("INSERT INTO cache_meta (key, value) VALUES ('key_normalizer', ?)", (signature,))
+                cursor.execute("INSERT INTO cache_meta (key, value) VALUES ('fuzzy_index', ?)",
+                               (FuzzyMatcher.signature(),))
+                cursor.execute("INSERT INTO cache_meta (key, value) VALUES ('fuzzy_backfill', 'done')")
+                cursor.execute(f'PRAGMA user_version={self.SCHEMA_VERSION}')
+            self._apply_key_normalizer(conn)
+            self._create_fuzzy_index(conn)
+            self._apply_fuzzy_index(conn)
+            cursor.execute('DROP INDEX IF EXISTS idx_created_at')
+            cursor.execute('DROP INDEX IF EXISTS idx_eviction')
+            self._create_indexes(conn)
 
             conn.commit()
             conn.close()
         except Exception as e:
             print(f"データベース初期化エラー: {e}")
 
-    async def save_translation(self, message: str, translation: str, target_lang: str) -> bool:
-        """翻訳を保存"""
+    @staticmethod
+    def _create_translations_table(conn: sqlite3.Connection, name: str):
+        """翻訳テーブルを作成
+
+        メッセージ本文にはインデックスを張らず、(正規化メッセージ, 翻訳先言語)の
+        64bitハッシュをrowidとして直接引く。ハッシュ衝突は取得時に本文を照合して検出する。
+        """
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {name} (
+                key_hash INTEGER PRIMARY KEY,
+                message TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                engine TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_used TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                hit_count INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+
+    @staticmethod
+    def _create_indexes(conn: sqlite3.Connection):
+        """退避処理・期間指定クリーンアップ用のインデックスを作成"""
+        # ヒットした翻訳は残すため、作成日時ではなく最終利用日時で判定する
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_last_used
+            ON translations(last_used)
+        ''')
+
+    @staticmethod
+    def _create_stats_table(conn: sqlite3.Connection):
+        """言語別の件数・バイト数を保持する集計テーブルと更新トリガーを作成"""
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS translation_stats (
+                target_lang TEXT PRIMARY KEY,
+                row_count INTEGER NOT NULL DEFAULT 0,
+                total_bytes INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        ''')
+        # ヒット記録（hit_count/last_usedの更新）では発火しないよう、対象カラムを限定する
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_translations_stats_insert
+            AFTER INSERT ON translations
+            BEGIN
+                INSERT INTO translation_stats (target_lang, row_count, total_bytes)
+                VALUES (NEW.target_lang, 1,
+                        length(CAST(NEW.message AS BLOB)) + length(CAST(NEW.translation AS BLOB)))
+                ON CONFLICT(target_lang) DO UPDATE SET
+                    row_count = row_count + 1,
+                    total_bytes = total_bytes + excluded.total_bytes;
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_translations_stats_delete
+            AFTER DELETE ON translations
+            BEGIN
+                UPDATE translation_stats SET
+                    row_count = row_count - 1,
+                    total_bytes = total_bytes
+                        - length(CAST(OLD.message AS BLOB)) - length(CAST(OLD.translation AS BLOB))
+                WHERE target_lang = OLD.target_lang;
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_translations_stats_update
+            AFTER UPDATE OF message, target_lang, translation ON translations
+            BEGIN
+                UPDATE translation_stats SET
+                    row_count = row_count - 1,
+                    total_bytes = total_bytes
+                        - length(CAST(OLD.message AS BLOB)) - length(CAST(OLD.translation AS BLOB))
+                WHERE target_lang = OLD.target_lang;
+                INSERT INTO translation_stats (target_lang, row_count, total_bytes)
+                VALUES (NEW.target_lang, 1,
+                        length(CAST(NEW.message AS BLOB)) + length(CAST(NEW.translation AS BLOB)))
+                ON CONFLICT(target_lang) DO UPDATE SET
+                    row_count = row_count + 1,
+                    total_bytes = total_bytes + excluded.total_bytes;
+            END
+        ''')
+
+    @staticmethod
+    def _create_meta_table(conn: sqlite3.Connection):
+        """キャッシュの設定（キーの正規化方式など）を記録するテーブルを作成"""
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            ) WITHOUT ROWID
+        ''')
+
+    @staticmethod
+    def _create_fuzzy_index(conn: sqlite3.Connection):
+        """あいまい検索の索引（バンドハッシュ → 翻訳のkey_hash）と削除トリガーを作成"""
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS fuzzy_index (
+                band_hash INTEGER NOT NULL,
+                key_hash INTEGER NOT NULL,
+                PRIMARY KEY (band_hash, key_hash)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_fuzzy_key ON fuzzy_index(key_hash)')
+        # 退避・クリーンアップで削除された翻訳の索引を消す（翻訳の更新ではキーが変わらない）
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_translations_fuzzy_delete
+            AFTER DELETE ON translations
+            BEGIN
+                DELETE FROM fuzzy_index WHERE key_hash = OLD.key_hash;
+            END
+        ''')
+
+    def _apply_fuzzy_index(self, conn: sqlite3.Connection):
+        """索引の構成をDBの記録と照合し、変わっていれば索引を空にして登録し直す"""
+        row = conn.execute("SELECT value FROM cache_meta WHERE key = 'fuzzy_index'").fetchone()
+        signature = FuzzyMatcher.signature()
+        if row is None or row[0] != signature:
+            conn.execute('DELETE FROM fuzzy_index')
+            conn.execute("INSERT OR REPLACE INTO cache_meta (key, value) VALUES ('fuzzy_index', ?)", (signature,))
+            conn.execute("INSERT OR REPLACE INTO cache_meta (key, value) VALUES ('fuzzy_backfill', '')")
+        row = conn.execute("SELECT value FROM cache_meta WHERE key = 'fuzzy_backfill'").fetchone()
+        self._fuzzy_backfill = None if row is None or row[0] == 'done' else row[0]
+
+    @classmethod
+    def _rebuild_stats(cls, conn: sqlite3.Connection):
+        """言語別集計テーブルとトリガーを作り直し、既存行から集計する"""
+        conn.execute('DROP TABLE IF EXISTS translation_stats')
+        cls._create_stats_table(conn)
+        conn.execute('''
+            INSERT INTO translation_stats (target_lang, row_count, total_bytes)
+            SELECT target_lang, COUNT(*),
+                   SUM(length(CAST(message AS BLOB)) + length(CAST(translation AS BLOB)))
+            FROM translations GROUP BY target_lang
+        ''')
+
+    def _apply_key_normalizer(self, conn: sqlite3.Connection):
+        """キーの正規化設定をDBの記録と照合し、変わっていればキーの再計算を予約する
+
+        key_normalizerが未指定の場合は、DBに記録された設定を採用する。
+        """
+        row = conn.execute("SELECT value FROM cache_meta WHERE key = 'key_normalizer'").fetchone()
+        stored = row[0] if row else ""
+        if self.key_normalizer is None:
+            self.key_normalizer = KeyNormalizer.from_signature(stored)
+            return
+        self._rekey_pending = self.key_normalizer.signature != stored
+
+    async def rekey(self) -> bool:
+        """予約されたキーの再計算をスレッドで実行する（サービスのループで起動時に呼ぶ）
+
+        再計算中は書き込み待ちの翻訳をDBへ反映せず、完了後にまとめて書き込む。
+        既存の翻訳は再計算が終わるまでヒットしない。
+
+        Returns:
+            bool: 再計算した場合True
+        """
+        if not self._rekey_pending or self.rekeying:
+            return False
+        self._rekey_future = asyncio.ensure_future(asyncio.to_thread(self._rekey_sync))
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute(
-                    '''INSERT OR REPLACE INTO translations
-                       (message, target_lang, translation)
-                       VALUES (?, ?, ?)''',
-                    (message, target_lang, translation)
-                )
-                await db.commit()
+            await asyncio.shield(self._rekey_future)
+            self._rekey_pending = False
+            self._fuzzy_backfill = ''
             return True
         except Exception as e:
-            print(f"翻訳保存エラー: {e}")
+            print(f"翻訳キャッシュのキー再計算エラー: {e}")
             return False
+        finally:
+            self._schedule_flush()
+
+    @property
+    def rekeying(self) -> bool:
+        """キーの再計算中か"""
+        return self._rekey_future is not None and not self._rekey_future.done()
+
+    def _rekey_sync(self):
+        """専用のコネクションでキーを再計算する（スレッドで実行）"""
+        conn = sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        try:
+            self._rekey_table(conn)
+        finally:
+            conn.close()
+
+    def _rekey_table(self, conn: sqlite3.Connection):
+        """新しい正規化設定でキーを再計算し、翻訳テーブルを作り直す（1トランザクション）"""
+        normalizer = self.key_normalizer
+        signature = normalizer.signature
+        conn.create_function(
+            'ttfn_key_hash', 2,
+            lambda message, target_lang: cache_key_hash(normalizer(message), target_lang),
+            deterministic=True
+        )
+        conn.execute('BEGIN')
+        conn.execute('DROP TABLE IF EXISTS translations_rekey')
+        self._create_translations_table(conn, 'translations_rekey')
+        # 新しいキーで同一となる行は統合する（新しい翻訳を優先し、ヒット数は合算）
+        conn.execute('''
+            INSERT INTO translations_rekey
+                (key_hash, message, target_lang, translation, engine, created_at, last_used, hit_count)
+            SELECT ttfn_key_hash(message, target_lang), message, target_lang, translation, engine,
+                   created_at, last_used, hit_count
+            FROM translations WHERE true ORDER BY created_at
+            ON CONFLICT(key_hash) DO UPDATE SET
+                message = excluded.message,
+                target_lang = excluded.target_lang,
+                translation = excluded.translation,
+                engine = excluded.engine,
+                created_at = min(translations_rekey.created_at, excluded.created_at),
+                last_used = max(translations_rekey.last_used, excluded.last_used),
+                hit_count = translations_rekey.hit_count + excluded.hit_count
+        ''')
+        before = conn.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+        conn.execute('DROP TABLE translations')
+        conn.execute('ALTER TABLE translations_rekey RENAME TO translations')
+        self._rebuild_stats(conn)
+        self._create_indexes(conn)
+        conn.execute("INSERT OR REPLACE INTO cache_meta (key, value) VALUES ('key_normalizer', ?)", (signature,))
+        # あいまい検索の索引も新しいキーで登録し直す（削除トリガーはテーブルとともに消えるため作り直す）
+        self._create_fuzzy_index(conn)
+        conn.execute('DELETE FROM fuzzy_index')
+        conn.execute(self.FUZZY_BACKFILL_SQL, ('',))
+        conn.execute('COMMIT')
+        after = conn.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+        print(f"翻訳キャッシュ: キーの正規化設定が変わったため再計算しました（{before}件 → {after}件）")
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """既存データベースのスキーマを現行バージョンへ移行"""
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version >= self.SCHEMA_VERSION:
+            return
+
+        if version < 1:
+            # v1: 退避処理用の利用状況カラム
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(translations)')}
+            if 'last_used' not in columns:
+                conn.execute('ALTER TABLE translations ADD COLUMN last_used TIMESTAMP')
+                conn.execute('UPDATE translations SET last_used = created_at')
+            if 'hit_count' not in columns:
+                conn.execute('ALTER TABLE translations ADD COLUMN hit_count INTEGER NOT NULL DEFAULT 0')
+            conn.commit()
+
+        if version < 2:
+            # v2: UNIQUE(message, target_lang)と重複インデックスを廃止し、ハッシュキーのテーブルへ移し替える
+            conn.create_function(
+                'ttfn_key_hash', 2,
+                lambda message, target_lang: cache_key_hash(normalize_text(message), target_lang),
+                deterministic=True
+            )
+            conn.execute('BEGIN')
+            conn.execute('DROP TABLE IF EXISTS translations_v2')
+            self._create_translations_table(conn, 'translations_v2')
+            # 正規化後に同一となる行は統合する（新しい翻訳を優先し、ヒット数は合算）
+            conn.execute('''
+                INSERT INTO translations_v2
+                    (key_hash, message, target_lang, translation, created_at, last_used, hit_count)
+                SELECT ttfn_key_hash(message, target_lang), message, target_lang, translation,
+                       created_at, last_used, hit_count
+                FROM translations WHERE true ORDER BY id
+                ON CONFLICT(key_hash) DO UPDATE SET
+                    message = excluded.message,
+                    target_lang = excluded.target_lang,
+                    translation = excluded.translation,
+                    created_at = min(translations_v2.created_at, excluded.created_at),
+                    last_used = max(translations_v2.last_used, excluded.last_used),
+                    hit_count = translations_v2.hit_count + excluded.hit_count
+            ''')
+            conn.execute('DROP TABLE translations')
+            conn.execute('ALTER TABLE translations_v2 RENAME TO translations')
+            conn.execute('COMMIT')
+
+        if version < 3:
+            # v3: 言語別集計テーブル（既存行から1度だけ集計）
+            conn.execute('BEGIN')
+            self._rebuild_stats(conn)
+            conn.execute('COMMIT')
+
+        if version < 4:
+            # v4: 翻訳したエンジン（google / deepl / gas、不明な行はNULL）
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(translations)')}
+            if 'engine' not in columns:
+                conn.execute('ALTER TABLE translations ADD COLUMN engine TEXT')
+            conn.commit()
+
+        if version < 5:
+            # v5: キャッシュ設定テーブル（既存のキーは空白の正規化のみで作られている）
+            self._create_meta_table(conn)
+            conn.execute("INSERT OR IGNORE INTO cache_meta (key, value) VALUES ('key_normalizer', '')")
+            conn.commit()
+
+        if version < 6:
+            # v6: あいまい検索の索引（既存の行はアイドル時に少しずつ登録する）
+            self._create_fuzzy_index(conn)
+            conn.commit()
+
+        if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+            # auto_vacuumの変更は既存ファイルではVACUUM後に有効になる（初回のみ）
+            conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            conn.execute('VACUUM')
+
+        conn.execute(f'PRAGMA user_version={self.SCHEMA_VERSION}')
+        conn.commit()
+
+    async def _open_connection(self, readonly: bool) -> aiosqlite.Connection:
+        """チューニング済みのコネクションを開く"""
+        conn = await aiosqlite.connect(self.db_path)
+        await conn.execute('PRAGMA journal_mode=WAL')
+        await conn.execute('PRAGMA synchronous=NORMAL')
+        await conn.execute(f'PRAGMA cache_size=-{self.CACHE_SIZE_KB}')
+        await conn.execute(f'PRAGMA mmap_size={self.MMAP_SIZE}')
+        await conn.execute('PRAGMA temp_store=MEMORY')
+        await conn.execute(f'PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}')
+        await conn.execute(f'PRAGMA journal_size_limit={self.MAX_SIZE // 4}')
+        if readonly:
+            await conn.execute('PRAGMA query_only=ON')
+        return conn
+
+    async def _get_writer(self) -> aiosqlite.Connection:
+        """書き込み用コネクションを取得（初回のみ接続）"""
+        if self._writer is None:
+            conn = await self._open_connection(readonly=False)
+            # 接続待ちの間に別のタスクが先に接続した場合はそちらを使う
+            if self._writer is None:
+                self._writer = conn
+            else:
+                await conn.close()
+        return self._writer
+
+    async def _get_reader(self) -> aiosqlite.Connection:
+        """読み取り用コネクションを取得（初回のみ接続）"""
+        if self._reader is None:
+            conn = await self._open_connection(readonly=True)
+            if self._reader is None:
+                self._reader = conn
+            else:
+                await conn.close()
+        return self._reader
+
+    async def close(self):
+        """書き込み待ちを反映してからコネクションを閉じる"""
+        self._cancel_background_tasks()
+        if self.rekeying:
+            # スレッドで実行中のキー再計算は取り消せないため、終わるのを待つ
+            try:
+                await asyncio.shield(self._rekey_future)
+            except Exception:
+                pass
+        await self.flush()
+        writer, self._writer = self._writer, None
+        reader, self._reader = self._reader, None
+        for conn in (reader, writer):
+            if conn is None:
+                continue
+            try:
+                await conn.close()
+            except Exception as e:
+                print(f"データベース切断エラー: {e}")
+
+    def close_nowait(self):
+        """イベントループ外からコネクションの終了を要求する"""
+        self._cancel_background_tasks()
+        self.flush_sync()
+        writer, self._writer = self._writer, None
+        reader, self._reader = self._reader, None
+        for conn in (reader, writer):
+            if conn is not None:
+                conn.stop()
+
+    async def save_translation(self, message: str, translation: str, target_lang: str,
+                               engine: Optional[str] = None) -> bool:
+        """翻訳を保存（書き込み待ちバッファに追加し、まとめてDBへ反映）
+
+        Args:
+            engine: 翻訳したエンジン（google / deepl / gas）
+        """
+        surface = normalize_text(message)
+        cache_key = (self.key_normalizer(message), target_lang)
+        self.saves += 1
+        if cache_key[0] != surface:
+            self.normalized_saves += 1
+        self.memory_cache.put(cache_key, (translation, surface))
+        with self._pending_lock:
+            self._pending[cache_key] = (message, target_lang, translation, engine)
+            pending_count = len(self._pending)
+
+        if pending_count >= self.flush_max_rows:
+            return await self.flush() >= 0
+        self._schedule_flush()
+        return True
+
+    def _schedule_flush(self):
+        """一定時間後のフラッシュを予約（予約済みなら何もしない）"""
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+        except RuntimeError:
+            # イベントループ外から呼ばれた場合は即座に同期書き込み
+            self.flush_sync()
+
+    async def _flush_later(self):
+        """フラッシュ間隔だけ待ってから書き込む"""
+        try:
+            await asyncio.sleep(self.flush_interval)
+        except asyncio.CancelledError:
+            return
+        await self.flush()
+
+    def _cancel_background_tasks(self):
+        """予約済みのフラッシュ・実行中の退避処理を取り消す"""
+        tasks = (self._flush_task, self._eviction_task)
+        self._flush_task = None
+        self._eviction_task = None
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for task in tasks:
+            if task is None or task.done():
+                continue
+            loop = task.get_loop()
+            if loop is running:
+                task.cancel()
+            elif not loop.is_closed():
+                loop.call_soon_threadsafe(task.cancel)
+
+    def _take_pending(self) -> Dict[Tuple[str, str], Tuple[str, str, str, Optional[str]]]:
+        """書き込み待ちを取り出し、書き込み中リストへ移す"""
+        with self._pending_lock:
+            batch, self._pending = self._pending, {}
+            if batch:
+                self._flushing.append(batch)
+            return batch
+
+    def _finish_batch(self, batch: Dict[Tuple[str, str], Tuple[str, str, str, Optional[str]]], success: bool):
+        """書き込み中リストからバッチを外す（失敗時は未反映分を書き込み待ちへ戻す）"""
+        with self._pending_lock:
+            self._flushing = [b for b in self._flushing if b is not batch]
+            if not success:
+                for key, row in batch.items():
+                    self._pending.setdefault(key, row)
+
+    def _record_hit(self, cache_key: Tuple[str, str], surface: str, stored_surface: str):
+        """キャッシュヒットを記録（次回のフラッシュでhit_count/last_usedに反映）
+
+        原文の表記が保存済みの翻訳と異なる場合は、正規化によるヒットとして数える。
+        """
+        self.hits += 1
+        if surface != stored_surface:
+            self.normalized_hits += 1
+        self._add_pending_hit(cache_key)
+
+    def _add_pending_hit(self, cache_key: Tuple[str, str]):
+        """保存済みの翻訳のヒット回数を書き込み待ちに加える"""
+        with self._pending_lock:
+            self._pending_hits[cache_key] = self._pending_hits.get(cache_key, 0) + 1
+        self._schedule_flush()
+
+    def _take_hits(self) -> List[Tuple[int, int]]:
+        """記録済みのヒットを (回数, key_hash) のリストとして取り出す"""
+        with self._pending_lock:
+            hits, self._pending_hits = self._pending_hits, {}
+        return [(count, cache_key_hash(*key)) for key, count in hits.items()]
+
+    @staticmethod
+    def _batch_rows(batch: Dict[Tuple[str, str], Tuple[str, str, str, Optional[str]]]
+                    ) -> List[Tuple[int, str, str, str, Optional[str]]]:
+        """書き込み待ちバッチをUPSERT用の行に変換"""
+        return [(cache_key_hash(*key),) + row for key, row in batch.items()]
+
+    def _fuzzy_entries(self, keys: List[Tuple[int, str, str]]) -> List[Tuple[int, int]]:
+        """(key_hash, 正規化キー, 翻訳先言語) のリストから索引の行 (band_hash, key_hash) を作る"""
+        entries = []
+        for key_hash, key, target_lang in keys:
+            if self.fuzzy_matcher.indexable(key):
+                entries.extend((band, key_hash) for band in self.fuzzy_matcher.band_hashes(key, target_lang))
+        return entries
+
+    def _message_fuzzy_entries(self, rows: List[Tuple[int, str, str]]) -> List[Tuple[int, int]]:
+        """(key_hash, 原文, 翻訳先言語) のリストから索引の行を作る"""
+        normalizer = self.key_normalizer
+        return self._fuzzy_entries([(key_hash, normalizer(message), lang) for key_hash, message, lang in rows])
+
+    def _batch_fuzzy_writes(self, batch: Dict[Tuple[str, str], Tuple[str, str, str, Optional[str]]]
+                            ) -> List[Tuple[str, List[tuple]]]:
+        """書き込み待ちバッチの索引の更新（SQL, 行のリスト）"""
+        if not batch:
+            return []
+        if self.fuzzy_matcher.enabled:
+            return [(self.FUZZY_INDEX_SQL, self._fuzzy_entries([(cache_key_hash(*key),) + key for key in batch]))]
+        return self._fuzzy_stale_writes()
+
+    def _fuzzy_stale_writes(self) -> List[Tuple[str, List[tuple]]]:
+        """あいまい検索が無効の間はMinHashを計算せず、有効にしたとき先頭から索引に登録し直すよう記録する"""
+        if self._fuzzy_backfill == '':
+            return []
+        self._fuzzy_backfill = ''
+        return [(self.FUZZY_BACKFILL_SQL, [('',)])]
+
+    def _lookup_pending(self, cache_key: Tuple[str, str]) -> Optional[Tuple[str, str, str, Optional[str]]]:
+        """書き込み待ち・書き込み中のバッファから (原文, 翻訳先言語, 翻訳, エンジン) を探す"""
+        with self._pending_lock:
+            row = self._pending.get(cache_key)
+            if row is None:
+                for batch in reversed(self._flushing):
+                    row = batch.get(cache_key)
+                    if row is not None:
+                        break
+            return row
+
+    async def flush(self) -> int:
+        """書き込み待ちの翻訳を1トランザクションで書き込む
+
+        Returns:
+            int: 書き込んだ件数（失敗時は -1）
+        """
+        if self.rekeying:
+            # キーの再計算中は書き込まず、完了後にまとめて反映する
+            return 0
+        batch = self._take_pending()
+        hits = self._take_hits()
+        if not batch and not hits:
+            return 0
+        try:
+            db = await self._get_writer()
+            if batch:
+                await db.executemany(self.UPSERT_SQL, self._batch_rows(batch))
+                for sql, rows in self._batch_fuzzy_writes(batch):
+                    await db.executemany(sql, rows)
+            if hits:
+                await db.executemany(self.HIT_SQL, hits)
+            await db.commit()
+            self._finish_batch(batch, True)
+        except Exception as e:
+            print(f"翻訳保存エラー: {e}")
+            self._finish_batch(batch, False)
+            return -1
+
+        if batch:
+            self.check_size_and_cleanup()
+        return len(batch)
+
+    def flush_sync(self) -> int:
+        """書き込み待ちの翻訳を同期的に書き込む（イベントループ外での終了処理用）"""
+        batch = self._take_pending()
+        hits = self._take_hits()
+        if not batch and not hits:
+            return 0
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT_MS / 1000)
+            try:
+                with conn:
+                    conn.executemany(self.UPSERT_SQL, self._batch_rows(batch))
+                    for sql, rows in self._batch_fuzzy_writes(batch):
+                        conn.executemany(sql, rows)
+                    conn.executemany(self.HIT_SQL, hits)
+            finally:
+                conn.close()
+            self._finish_batch(batch, True)
+            return len(batch)
+        except Exception as e:
+            print(f"翻訳保存エラー: {e}")
+            self._finish_batch(batch, False)
+            return -1
 
     async def get_translation(self, message: str, target_lang: str) -> Optional[str]:
-        """翻訳を取得"""
+        """翻訳を取得（インメモリLRU → 書き込み待ち → SQLite → あいまい検索の順に参照）"""
+        surface = normalize_text(message)
+        cache_key = (self.key_normalizer(message), target_lang)
+        self.lookups += 1
+        cached = self.memory_cache.get(cache_key)
+        if cached is not None:
+            self._record_hit(cache_key, surface, cached[1])
+            return cached[0]
+
+        pending = self._lookup_pending(cache_key)
+        if pending is not None:
+            self.memory_cache.put(cache_key, (pending[2], normalize_text(pending[0])))
+            self._record_hit(cache_key, surface, normalize_text(pending[0]))
+            return pending[2]
+
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute(
-                    '''SELECT translation FROM translations
-                       WHERE message = ? AND target_lang = ?''',
-                    (message, target_lang)
-                )
+            db = await self._get_reader()
+            async with db.execute(
+                '''SELECT message, target_lang, translation FROM translations
+                   WHERE key_hash = ?''',
+                (cache_key_hash(*cache_key),)
+            ) as cursor:
                 row = await cursor.fetchone()
-                return row[0] if row else None
+            # ハッシュ衝突の検出: 本文と言語が一致する場合のみ採用
+            if row and row[1] == target_lang and self.key_normalizer(row[0]) == cache_key[0]:
+                stored_surface = normalize_text(row[0])
+                self.memory_cache.put(cache_key, (row[2], stored_surface))
+                self._record_hit(cache_key, surface, stored_surface)
+                return row[2]
+            if self.fuzzy_matcher.enabled_for(*cache_key):
+                return await self._get_similar_translation(db, cache_key)
+            return None
         except Exception as e:
             print(f"翻訳取得エラー: {e}")
             return None
 
+    async def _get_similar_translation(self, db: aiosqlite.Connection, cache_key: Tuple[str, str]) -> Optional[str]:
+        """索引で似たメッセージを探し、最も類似度の高い翻訳を返す
+
+        LSHのバンドが多く一致した候補から順にFUZZY_MAX_CANDIDATES件を確認する。
+        あいまい一致の結果はインメモリLRUに載せない（原文と翻訳が対応しない組を
+        完全一致のキャッシュとして扱わないため）。
+        """
+        key, target_lang = cache_key
+        self.fuzzy_lookups += 1
+        bands = self.fuzzy_matcher.band_hashes(key, target_lang)
+        rows = await db.execute_fetchall(
+            f'''SELECT t.message, t.target_lang, t.translation
+                FROM (SELECT key_hash, COUNT(*) AS shared FROM fuzzy_index
+                      WHERE band_hash IN ({','.join('?' * len(bands))})
+                      GROUP BY key_hash ORDER BY shared DESC LIMIT ?) AS c
+                JOIN translations AS t ON t.key_hash = c.key_hash
+                ORDER BY c.shared DESC''',
+            bands + [self.FUZZY_MAX_CANDIDATES]
+        )
+        self.fuzzy_candidates += len(rows)
+        best, best_score = None, 0.0
+        for message, lang, translation in rows:
+            if lang != target_lang:
+                continue
+            stored_key = self.key_normalizer(message)
+            score = self.fuzzy_matcher.similarity(key, stored_key)
+            if score is not None and score > best_score:
+                best, best_score = (stored_key, translation), score
+        if best is None:
+            return None
+        self.fuzzy_hits += 1
+        self._add_pending_hit((best[0], target_lang))
+        return best[1]
+
     async def get_recent_translations(self, limit: int = 100) -> List[Dict[str, Any]]:
         """最近の翻訳履歴を取得"""
+        await self.flush()
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute(
-                    '''SELECT message, translation, target_lang, created_at
-                       FROM translations
-                       ORDER BY created_at DESC
-                       LIMIT ?''',
-                    (limit,)
-                )
-                rows = await cursor.fetchall()
-                return [
-                    {
-                        'message': row[0],
-                        'translation': row[1],
-                        'target_lang': row[2],
-                        'created_at': row[3]
-                    }
-                    for row in rows
-                ]
+            db = await self._get_reader()
+            rows = await db.execute_fetchall(
+                '''SELECT message, translation, target_lang, created_at, engine
+                   FROM translations
+                   ORDER BY created_at DESC
+                   LIMIT ?''',
+                (limit,)
+            )
+            return [
+                {
+                    'message': row[0],
+                    'translation': row[1],
+                    'target_lang': row[2],
+                    'created_at': row[3],
+                    'engine': row[4]
+                }
+                for row in rows
+            ]
         except Exception as e:
             print(f"翻訳履歴取得エラー: {e}")
             return []
 
     async def get_statistics(self) -> Dict[str, Any]:
-        """統計情報を取得"""
+        """統計情報を取得（集計テーブルを参照するため件数に依存しない）"""
+        await self.flush()
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute('SELECT COUNT(*) FROM translations')
-                total_count = (await cursor.fetchone())[0]
-
-                cursor = await db.execute(
-                    '''SELECT target_lang, COUNT(*)
-                       FROM translations
-                       GROUP BY target_lang
-                       ORDER BY COUNT(*) DESC'''
-                )
-                lang_stats = await cursor.fetchall()
+            db = await self._get_reader()
+            lang_stats = await db.execute_fetchall(
+                '''SELECT target_lang, row_count, total_bytes
+                   FROM translation_stats
+                   WHERE row_count > 0
+                   ORDER BY row_count DESC'''
+            )
 
-                db_size = os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
+            db_size = self._file_size()
 
-                return {
-                    'total_translations': total_count,
-                    'language_stats': [{'lang': row[0], 'count': row[1]} for row in lang_stats],
-                    'database_size': db_size,
-                    'database_size_mb': round(db_size / 1024 / 1024, 2)
-                }
+            return {
+                'total_translations': sum(row[1] for row in lang_stats),
+                'total_bytes': sum(row[2] for row in lang_stats),
+                'language_stats': [
+                    {'lang': row[0], 'count': row[1], 'bytes': row[2]} for row in lang_stats
+                ],
+                'database_size': db_size,
+                'database_size_mb': round(db_size / 1024 / 1024, 2),
+                'memory_cache': self.memory_cache.stats(),
+                'key_normalization': self.get_key_stats(),
+                'fuzzy_match': self.get_fuzzy_stats()
+            }
         except Exception as e:
             print(f"統計情報取得エラー: {e}")
             return {
                 'total_translations': 0,
+                'total_bytes': 0,
                 'language_stats': [],
                 'database_size': 0,
-                'database_size_mb': 0
+                'database_size_mb': 0,
+                'memory_cache': self.memory_cache.stats(),
+                'key_normalization': self.get_key_stats(),
+                'fuzzy_match': self.get_fuzzy_stats()
             }
 
-    async def cleanup_old_translations(self, keep_days: int = 30) -> int:
-        """古い翻訳を削除"""
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """インメモリキャッシュのヒット・ミス・追い出し件数を取得"""
+        return self.memory_cache.stats()
+
+    def get_key_stats(self) -> Dict[str, Any]:
+        """キーの正規化によるヒット率の向上（hit_rate_gain）と、正規化したキーで保存した件数"""
+        lookups = self.lookups
+        return {
+            'normalizer': self.key_normalizer.signature,
+            'lookups': lookups,
+            'hits': self.hits,
+            'normalized_hits': self.normalized_hits,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'hit_rate_gain': round(self.normalized_hits / lookups, 4) if lookups else 0.0,
+            'saves': self.saves,
+            'normalized_saves': self.normalized_saves,
+        }
+
+    def get_fuzzy_stats(self) -> Dict[str, Any]:
+        """あいまい検索の検索・一致件数（1件の検索で確認した候補数の平均を含む）"""
+        lookups = self.fuzzy_lookups
+        return {
+            'enabled': self.fuzzy_matcher.enabled,
+            'lookups': lookups,
+            'hits': self.fuzzy_hits,
+            'hit_rate': round(self.fuzzy_hits / lookups, 4) if lookups else 0.0,
+            'average_candidates': round(self.fuzzy_candidates / lookups, 2) if lookups else 0.0,
+            'backfill_pending': self.needs_fuzzy_backfill,
+        }
+
+    @property
+    def needs_fuzzy_backfill(self) -> bool:
+        """あいまい検索の索引に未登録の既存行が残っているか"""
+        return self._fuzzy_backfill is not None
+
+    async def backfill_fuzzy_index(self, should_continue: Optional[Callable[[], bool]] = None) -> int:
+        """索引に未登録の既存行をkey_hash順にFUZZY_BACKFILL_ROWS件ずつ登録する
+
+        進み具合はcache_metaに記録し、中断しても次回は続きから登録する。
+        MinHashの計算はスレッドで行い、チャンクの間では他の処理に譲る。
+        should_continueがFalseを返したら中断する。
+
+        Returns:
+            int: 索引に登録した翻訳の件数
+        """
+        indexed = 0
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            db = await self._get_writer()
+            while self._fuzzy_backfill is not None:
+                position = self._fuzzy_backfill
+                if position:
+                    rows = await db.execute_fetchall(
+                        '''SELECT key_hash, message, target_lang FROM translations
+                           WHERE key_hash > ? ORDER BY key_hash LIMIT ?''',
+                        (int(position), self.FUZZY_BACKFILL_ROWS)
+                    )
+                else:
+                    rows = await db.execute_fetchall(
+                        '''SELECT key_hash, message, target_lang FROM translations
+                           ORDER BY key_hash LIMIT ?''',
+                        (self.FUZZY_BACKFILL_ROWS,)
+                    )
+                if rows:
+                    entries = await asyncio.to_thread(self._message_fuzzy_entries, rows)
+                    await db.executemany(self.FUZZY_INDEX_SQL, entries)
+                    indexed += len(rows)
+                position = str(rows[-1][0]) if len(rows) == self.FUZZY_BACKFILL_ROWS else 'done'
+                await db.execute(self.FUZZY_BACKFILL_SQL, (position,))
+                await db.commit()
+                self._fuzzy_backfill = None if position == 'done' else position
+                if self._fuzzy_backfill is None:
+                    break
+                await asyncio.sleep(self.EVICTION_PAUSE)
+                if should_continue is not None and not should_continue():
+                    break
+            return indexed
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"あいまい検索の索引作成エラー: {e}")
+            return indexed
+
+    async def cleanup_old_translations(self, keep_days: int = 30,
+                                       should_continue: Optional[Callable[[], bool]] = None) -> int:
+        """keep_days日間使われていない翻訳を削除
+
+        last_usedのインデックスを使い、CLEANUP_CHUNK_ROWS件ずつ削除・コミットする。
+        チャンクの間では他の処理に譲り、should_continueがFalseを返したら中断する。
+
+        Returns:
+            int: 削除した件数
+        """
+        removed = 0
+        try:
+            db = await self._get_writer()
+            while True:
                 cursor = await db.execute(
-                    '''DELETE FROM translations
-                       WHERE created_at < datetime('now', ? || ' days')''',
-                    (-keep_days,)
+                    '''DELETE FROM translations WHERE key_hash IN (
+                           SELECT key_hash FROM translations
+                           WHERE last_used < datetime('now', ? || ' days')
+                           LIMIT ?)''',
+                    (-keep_days, self.CLEANUP_CHUNK_ROWS)
                 )
                 await db.commit()
-                return cursor.rowcount
+                removed += max(cursor.rowcount, 0)
+                if cursor.rowcount < self.CLEANUP_CHUNK_ROWS:
+                    break
+                await asyncio.sleep(self.EVICTION_PAUSE)
+                if should_continue is not None and not should_continue():
+                    break
+
+            if removed:
+                await db.executescript('PRAGMA incremental_vacuum;')
+            return removed
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             print(f"翻訳クリーンアップエラー: {e}")
-            return 0
+            return removed
+
+    def _file_size(self) -> int:
+        """データベースファイルのサイズ（バイト）"""
+        return os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
 
     def check_size_and_cleanup(self) -> bool:
-        """サイズチェックとクリーンアップ（同期的に実行）"""
+        """サイズチェックとクリーンアップ
+
+        上限を超えていれば長く使われていない行の退避処理をバックグラウンドで開始する。
+        ファイルごと削除はしないため、よく使う翻訳は残る。
+
+        Returns:
+            bool: 退避処理を開始（または実行中）の場合True
+        """
         try:
-            if os.path.exists(self.db_path):
-                if os.path.getsize(self.db_path) >= self.MAX_SIZE:
-                    os.remove(self.db_path)
-                    self._init_database()
-                    return True
-            return False
+            if self._file_size() < self.MAX_SIZE:
+                return False
+            if self._eviction_task is not None and not self._eviction_task.done():
+                return True
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # イベントループ外から呼ばれた場合はその場で実行
+                asyncio.run(self.evict_cold_translations())
+                return True
+            self._eviction_task = loop.create_task(self.evict_cold_translations())
+            return True
         except Exception as e:
             print(f"データベースサイズチェックエラー: {e}")
             return False
 
+    async def _used_bytes(self, db: aiosqlite.Connection) -> int:
+        """空きページを除いた使用中サイズ（バイト）"""
+        rows = await db.execute_fetchall(
+            '''SELECT page_count - freelist_count, page_size
+               FROM pragma_page_count(), pragma_freelist_count(), pragma_page_size()'''
+        )
+        used_pages, page_size = rows[0]
+        return used_pages * page_size
+
+    async def evict_cold_translations(self, target_size: Optional[int] = None) -> int:
+        """最終利用日時の古い翻訳から少しずつ削除する
+
+        ヒット数だけで選ぶと、保存したばかり（ヒット数0）の翻訳が以前に1度だけヒットした
+        古い翻訳より先に消えるため、最終利用日時を優先し、ヒット数は同時刻の並びにだけ使う。
+        EVICTION_CHUNK_ROWS件ずつ削除・コミットし、チャンクごとに
+        インクリメンタルVACUUMで空きページを解放してから他の処理に譲る。
+
+        Returns:
+            int: 削除した件数
+        """
+        if target_size is None:
+            target_size = int(self.MAX_SIZE * self.EVICTION_TARGET_RATIO)
+        removed = 0
+        try:
+            db = await self._get_writer()
+            while await self._used_bytes(db) > target_size:
+                cursor = await db.execute(
+                    '''DELETE FROM translations WHERE key_hash IN (
+                           SELECT key_hash FROM translations
+                           ORDER BY last_used ASC, hit_count ASC
+                           LIMIT ?)''',
+                    (self.EVICTION_CHUNK_ROWS,)
+                )
+                await db.commit()
+                if cursor.rowcount <= 0:
+                    break
+                removed += cursor.rowcount
+                # incremental_vacuumは1ステップ1ページのため、executescriptで最後まで実行する
+                await db.executescript(f'PRAGMA incremental_vacuum({self.EVICTION_VACUUM_PAGES});')
+                await asyncio.sleep(self.EVICTION_PAUSE)
+
+            # 残りの空きページを解放し、WALをチェックポイントしてファイルを縮める
+            await db.executescript('PRAGMA incremental_vacuum;')
+            await db.execute_fetchall('PRAGMA wal_checkpoint(TRUNCATE)')
+            if removed:
+                print(f"翻訳キャッシュ退避: {removed}件を削除しました")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"翻訳キャッシュ退避エラー: {e}")
+        return removed
+
+    async def export_pack(self, path: str, target_lang: Optional[str] = None,
+                          min_hits: int = 0) -> int:
+        """翻訳メモリを翻訳パックとして書き出す
+
+        行は (翻訳先言語, メッセージ) 順に並べるため、同じ内容からは同じファイルができる。
+
+        Args:
+            path: 出力先（.jsonl.gz）
+            target_lang: 指定した翻訳先言語のみ書き出す
+            min_hits: この回数以上ヒットした翻訳のみ書き出す
+
+        Returns:
+            int: 書き出した件数（失敗時は -1）
+        """
+        await self.flush()
+        try:
+            conditions, params = ['hit_count >= ?'], [min_hits]
+            if target_lang:
+                conditions.append('target_lang = ?')
+                params.append(target_lang)
+            db = await self._get_reader()
+            rows = await db.execute_fetchall(
+                f'''SELECT message, target_lang, translation, hit_count
+                    FROM translations
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY target_lang, message''',
+                params
+            )
+            header = {
+                'format': self.PACK_FORMAT,
+                'version': self.PACK_VERSION,
+                'count': len(rows),
+                'target_lang': target_lang,
+            }
+            await asyncio.to_thread(self._write_pack, path, header, rows)
+            return len(rows)
+        except Exception as e:
+            print(f"翻訳パック書き出しエラー: {e}")
+            return -1
+
+    @staticmethod
+    def _write_pack(path: str, header: Dict[str, Any], rows) -> None:
+        """翻訳パックを一時ファイルに書き出してから置き換える"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as raw:
+            # mtime=0 で圧縮結果を内容だけで決まるようにする
+            with gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as gz:
+                gz.write((json.dumps(header, ensure_ascii=False) + "\n").encode('utf-8'))
+                for message, lang, translation, hits in rows:
+                    gz.write((json.dumps(
+                        {'m': message, 'l': lang, 't': translation, 'h': hits},
+                        ensure_ascii=False
+                    ) + "\n").encode('utf-8'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def _read_pack(cls, path: str, normalize: Callable[[str], str]) -> List[Tuple[int, str, str, str, int]]:
+        """翻訳パックを読み込み、取り込み用の行に変換（同じキーは後勝ち）"""
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            header = json.loads(f.readline() or 'null')
+            if not isinstance(header, dict) or header.get('format') != cls.PACK_FORMAT:
+                raise ValueError("翻訳パックではありません")
+            if header.get('version', 0) > cls.PACK_VERSION:
+                raise ValueError(f"未対応の翻訳パックバージョンです: {header.get('version')}")
+
+            rows: Dict[int, Tuple[int, str, str, str, int]] = {}
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                message, lang, translation = entry['m'], entry['l'], entry['t']
+                if not message or not lang or not translation:
+                    continue
+                key_hash = cache_key_hash(normalize(message), lang)
+                rows[key_hash] = (key_hash, message, lang, translation, int(entry.get('h', 0)))
+            return list(rows.values())
+
+    async def import_pack(self, path: str, overwrite: bool = False) -> int:
+        """翻訳パックを1トランザクションで取り込む
+
+        Args:
+            path: 翻訳パックのパス
+            overwrite: Trueなら既存の翻訳をパックの内容で上書きする（Falseなら既存を優先）
+
+        Returns:
+            int: 追加・更新した件数（失敗時は -1）
+        """
+        try:
+            rows = await asyncio.to_thread(self._read_pack, path, self.key_normalizer)
+            if self.fuzzy_matcher.enabled:
+                fuzzy_writes = [(self.FUZZY_INDEX_SQL,
+                                 await asyncio.to_thread(self._message_fuzzy_entries, [row[:3] for row in rows]))]
+            else:
+                fuzzy_writes = self._fuzzy_stale_writes() if rows else []
+        except Exception as e:
+            print(f"翻訳パック読み込みエラー: {e}")
+            return -1
+
+        # 書き込み待ちを先に反映し、取り込みとの順序を確定させる
+        await self.flush()
+        db = None
+        try:
+            db = await self._get_writer()
+            cursor = await db.executemany(
+                self.PACK_OVERWRITE_SQL if overwrite else self.PACK_IMPORT_SQL, rows
+            )
+            imported = max(cursor.rowcount, 0)
+            for sql, fuzzy_rows in fuzzy_writes:
+                await db.executemany(sql, fuzzy_rows)
+            await db.commit()
+        except Exception as e:
+            print(f"翻訳パック取り込みエラー: {e}")
+            if db is not None:
+                try:
+                    await db.rollback()
+                except Exception:
+                    pass
+            return -1
+
+        if overwrite:
+            for _, message, lang, _, _ in rows:
+                self.memory_cache.discard((self.key_normalizer(message), lang))
+        if imported:
+            self.check_size_and_cleanup()
+        return imported
+
     async def vacuum(self) -> bool:
         """データベース最適化"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute('VACUUM')
-                await db.commit()
+            db = await self._get_writer()
+            await db.commit()
+            await db.execute('VACUUM')
             return True
         except Exception as e:
             print(f"データベース最適化エラー: {e}")
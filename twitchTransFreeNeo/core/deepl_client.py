@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+DeepL APIクライアント（aiohttp）
+翻訳サービスのイベントループ上で共有HTTPクライアントのコネクションプールを使い、
+スレッドを占有せずにDeepL APIを呼び出す
+"""
+
+import json
+from typing import Optional, List, Dict, Tuple, Any
+
+try:
+    from .http_client import HTTPClient
+    from .rate_limit import check_response
+except ImportError:
+    from twitchTransFreeNeo.core.http_client import HTTPClient
+    from twitchTransFreeNeo.core.rate_limit import check_response
+
+
+class DeepLError(RuntimeError):
+    """DeepL APIのエラー"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class DeepLAuthorizationError(DeepLError):
+    """APIキーが無効（403）"""
+
+
+class DeepLQuotaExceededError(DeepLError):
+    """今月の翻訳文字数の上限に達した（456）"""
+
+
+class DeepLClient:
+    """DeepL API v2のクライアント
+
+    フリー版のキー（末尾が ":fx"）は api-free.deepl.com、それ以外は api.deepl.com を使う。
+    言語コードは本アプリの形式（ja, en, zh-CN など）で受け渡し、内部でDeepLの形式に変換する。
+    429・5xxはThrottledErrorとして送出し、レート制限側で待って再試行させる。
+    """
+
+    FREE_API_URL = "https://api-free.deepl.com/v2"
+    PRO_API_URL = "https://api.deepl.com/v2"
+    # 1リクエストに含められるテキスト数の上限
+    MAX_TEXTS = 50
+
+    # 本アプリの言語コード → DeepLの翻訳先言語コード
+    LANG_DICT = {
+        'de': 'DE', 'en': 'EN-US', 'fr': 'FR', 'es': 'ES',
+        'pt': 'PT-PT', 'it': 'IT', 'nl': 'NL', 'pl': 'PL',
+        'ru': 'RU', 'ja': 'JA', 'zh-CN': 'ZH', 'ko': 'KO'
+    }
+
+    def __init__(self, api_key: str, http: HTTPClient):
+        self.api_key = api_key
+        self.http = http
+        self.base_url = self.FREE_API_URL if api_key.endswith(":fx") else self.PRO_API_URL
+
+    @classmethod
+    def to_target_lang(cls, lang: str) -> str:
+        """翻訳先の言語コードをDeepLの形式に変換"""
+        return cls.LANG_DICT.get(lang, lang.upper())
+
+    @classmethod
+    def to_source_lang(cls, lang: Optional[str]) -> Optional[str]:
+        """翻訳元の言語コードをDeepLの形式に変換（翻訳元には地域の指定ができない）"""
+        if not lang or lang == "auto":
+            return None
+        return cls.to_target_lang(lang).split("-")[0]
+
+    @classmethod
+    def from_deepl_lang(cls, deepl_lang: Optional[str]) -> Optional[str]:
+        """DeepLの言語コードを本アプリの言語コードに変換"""
+        if not deepl_lang:
+            return None
+        for lang, code in cls.LANG_DICT.items():
+            if code.split("-")[0] == deepl_lang.upper():
+                return lang
+        return deepl_lang.lower()
+
+    async def translate(self, texts: List[str], target_lang: str,
+                        source_lang: Optional[str] = None) -> List[Tuple[str, Optional[str]]]:
+        """複数テキストを翻訳し、(翻訳結果, 検出された翻訳元言語) のリストを返す
+
+        Raises:
+            ThrottledError: 429・5xx
+            DeepLError: その他のエラー
+        """
+        results: List[Tuple[str, Optional[str]]] = []
+        for start in range(0, len(texts), self.MAX_TEXTS):
+            chunk = texts[start:start + self.MAX_TEXTS]
+            payload: Dict[str, Any] = {"text": chunk, "target_lang": self.to_target_lang(target_lang)}
+            source = self.to_source_lang(source_lang)
+            if source:
+                payload["source_lang"] = source
+            data = await self._request("POST", "/translate", payload)
+            translations = data.get("translations") or []
+            if len(translations) != len(chunk):
+                raise DeepLError(f"DeepL: 結果の件数が一致しません ({len(translations)}/{len(chunk)})")
+            results.extend(
+                (item.get("text", ""), self.from_deepl_lang(item.get("detected_source_language")))
+                for item in translations
+            )
+        return results
+
+    async def get_usage(self) -> Dict[str, Optional[int]]:
+        """今月の翻訳文字数と上限"""
+        data = await self._request("GET", "/usage")
+        return {
+            'character_count': data.get("character_count"),
+            'character_limit': data.get("character_limit"),
+        }
+
+    async def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """APIを呼び出してJSON応答を返す（ステータスコードに応じた例外を送出）"""
+        headers = {"Authorization": f"DeepL-Auth-Key {self.api_key}"}
+        async with self.http.session.request(method, self.base_url + path, json=payload,
+                                             headers=headers) as response:
+            check_response(response.status, response.headers, "DeepL")
+            body = await response.text()
+            status = response.status
+
+        if status == 403:
+            raise DeepLAuthorizationError("DeepL: 認証エラー (APIキーを確認してください)", status)
+        if status == 456:
+            raise DeepLQuotaExceededError("DeepL: 翻訳文字数の上限に達しました", status)
+        if status >= 400:
+            try:
+                message = json.loads(body).get("message", body)
+            except (ValueError, AttributeError):
+                message = body
+            raise DeepLError(f"DeepL: リクエストに失敗しました ({status}): {message}", status)
+        return json.loads(body)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+翻訳エンジン専用のスレッドプール
+ブロッキングする翻訳・言語検出ライブラリの呼び出しをasyncioの既定スレッドプールから
+切り離し、遅い翻訳先がDB処理やGUIの処理を待たせないようにする
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class BoundedExecutor:
+    """スレッド数を制限した名前付きスレッドプール
+
+    スレッド数を超えた呼び出しはプール内で順番待ちになる。待機件数と
+    実行中のスレッド数をstats()で取得できる。
+    """
+
+    def __init__(self, name: str, max_workers: int = 4):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.busy = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """funcをプールのスレッドで実行し、結果を待つ"""
+        # started: ワーカーが実行を開始した / withdrawn: 開始前に待機件数から外した
+        state = {"started": False, "withdrawn": False}
+        with self._lock:
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        try:
+            future = asyncio.get_running_loop().run_in_executor(
+                self._executor, functools.partial(self._call, state, func, *args, **kwargs)
+            )
+        except RuntimeError:
+            # シャットダウン後の投入
+            self._withdraw(state)
+            raise
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # 開始前に取り消された呼び出しは実行されない
+            self._withdraw(state)
+            raise
+
+    def _withdraw(self, state: Dict[str, bool]):
+        """実行されなかった呼び出しを待機件数から外す"""
+        with self._lock:
+            if not state["started"] and not state["withdrawn"]:
+                state["withdrawn"] = True
+                self.queued -= 1
+
+    def _call(self, state: Dict[str, bool], func: Callable, *args, **kwargs) -> Any:
+        """ワーカースレッドでの実行（待機・実行中の件数を更新）"""
+        with self._lock:
+            state["started"] = True
+            if not state["withdrawn"]:
+                self.queued -= 1
+            self.busy += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.busy -= 1
+                self.completed += 1
+
+    def shutdown(self):
+        """新たな投入を止める（実行中の呼び出しは完了まで続く）"""
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, int]:
+        """統計情報"""
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'busy': self.busy,
+                'queue_depth': self.queued,
+                'max_queue_depth': self.max_queue_depth,
+                'completed': self.completed,
+            }
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+翻訳メモリのあいまい検索
+1単語だけ違うコピペなど、キャッシュキーが一致しない似たメッセージにも既存の翻訳を使う。
+正規化したキーの文字n-gramからMinHashを計算してLSH（バンド分割）で索引化し、
+索引で絞り込んだ候補だけをn-gramの類似度・編集距離で確認する。
+"""
+
+import hashlib
+from typing import Optional, List, Set, Iterable
+
+
+# 索引の構成（変更するとDBの索引を作り直す）
+NGRAM = 3  # 文字n-gramの長さ
+BANDS = 10  # LSHのバンド数（1件あたりの索引行数）
+ROWS = 3  # 1バンドあたりのMinHash数
+INDEX_MIN_LENGTH = 10  # これより短いキーは索引に登録しない
+
+_PRIME = (1 << 61) - 1
+
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+# MinHashのハッシュ関数 (a * x + b) mod p の係数（実行ごとに変わらないよう固定の種から作る）
+_PERMUTATIONS = [
+    (_hash64(f"minhash-a-{i}") % (_PRIME - 1) + 1, _hash64(f"minhash-b-{i}") % _PRIME)
+    for i in range(BANDS * ROWS)
+]
+
+
+def shingles(text: str, n: int = NGRAM) -> Set[str]:
+    """文字n-gramの集合（n文字以下のテキストはテキスト全体を1要素とする）"""
+    if len(text) <= n:
+        return {text}
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """集合の類似度（Jaccard係数）"""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def edit_distance_within(a: str, b: str, limit: int) -> Optional[int]:
+    """編集距離（limitを超える場合はNone）
+
+    対角線からlimit以内のマスだけを計算するため、長いメッセージでも O(len × limit) で済む。
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    inf = limit + 1
+    previous = [j if j <= limit else inf for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [inf] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        row_min = current[0]
+        char = a[i - 1]
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            value = min(previous[j - 1] + (char != b[j - 1]), previous[j] + 1, current[j - 1] + 1)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return None
+        previous = current
+    return previous[len(b)] if previous[len(b)] <= limit else None
+
+
+class FuzzyMatcher:
+    """似たメッセージの判定と、LSH索引のキー（バンドハッシュ）の計算
+
+    enabled: あいまい検索を使う（無効の間は索引を更新せず、有効にした後のアイドル時に登録し直す）
+    languages: あいまい検索を使う翻訳先言語（空ならすべて、"pt" は "pt-BR" にも一致）
+    threshold: 文字n-gramの類似度がこれ以上なら同じ翻訳を使う
+    max_edits: 編集距離がこれ以下でも同じ翻訳を使う（0で無効）
+    min_length: これより短いメッセージは検索しない（短い文の1単語違いは意味が変わりやすい）
+    """
+
+    def __init__(self, enabled: bool = False, languages: Optional[Iterable[str]] = None,
+                 threshold: float = 0.8, max_edits: int = 2, min_length: int = 20):
+        self.enabled = enabled
+        self.languages = {lang.lower() for lang in languages or []}
+        self.threshold = threshold
+        self.max_edits = max(0, max_edits)
+        self.min_length = max(INDEX_MIN_LENGTH, min_length)
+
+    @staticmethod
+    def signature() -> str:
+        """索引の構成を表す文字列（DBに記録し、変わったら索引を作り直す）"""
+        return f"ngram{NGRAM},bands{BANDS}x{ROWS},min{INDEX_MIN_LENGTH}"
+
+    @staticmethod
+    def indexable(key: str) -> bool:
+        """索引に登録するキーか"""
+        return len(key) >= INDEX_MIN_LENGTH
+
+    def enabled_for(self, key: str, target_lang: str) -> bool:
+        """このキー・翻訳先言語であいまい検索を行うか"""
+        if not self.enabled or len(key) < self.min_length:
+            return False
+        if not self.languages:
+            return True
+        lang = target_lang.lower()
+        return lang in self.languages or lang.split('-')[0] in self.languages
+
+    @staticmethod
+    def band_hashes(key: str, target_lang: str) -> List[int]:
+        """索引のキー（翻訳先言語ごとのバンドハッシュ、SQLiteのINTEGERに収まる符号付き値）"""
+        hashes = [_hash64(shingle) for shingle in shingles(key)]
+        signature = [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+        bands = []
+        for band in range(BANDS):
+            values = ",".join(map(str, signature[band * ROWS:(band + 1) * ROWS]))
+            digest = hashlib.blake2b(f"{target_lang}\x00{band}\x00{values}".encode('utf-8'),
+                                     digest_size=8).digest()
+            bands.append(int.from_bytes(digest, 'big', signed=True))
+        return bands
+
+    def similarity(self, key: str, candidate: str) -> Optional[float]:
+        """候補が似ていれば類似度（0〜1）、似ていなければNone
+
+        類似度はn-gramの類似度と編集距離から求めた一致率の高い方（候補の順位付けに使う）。
+        """
+        score = jaccard(shingles(key), shingles(candidate))
+        matched = score >= self.threshold
+        if self.max_edits:
+            distance = edit_distance_within(key, candidate, self.max_edits)
+            if distance is not None:
+                matched = True
+                score = max(score, 1 - distance / max(len(key), len(candidate)))
+        return score if matched else None
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+翻訳エンジン用の共有HTTPクライアント
+コネクションプール付きのaiohttpセッションを使い回し、メッセージごとの
+TCP・TLSハンドシェイクを避ける
+"""
+
+import asyncio
+import aiohttp
+from typing import Optional, Iterable
+from urllib.parse import urlsplit
+
+
+class HTTPClient:
+    """キープアライブ・DNSキャッシュ付きのaiohttpセッションを保持するクライアント
+
+    セッションは最初に使われたイベントループ上で遅延生成する（aiohttpの
+    セッションはループに紐づくため、翻訳サービスのループからのみ使用する）。
+    """
+
+    USER_AGENT = "Mozilla/5.0 (compatible; twitchTransFreeNeo)"
+
+    def __init__(self, pool_size: int = 10, dns_cache_seconds: int = 300,
+                 keepalive_seconds: float = 60, timeout_seconds: float = 10):
+        self.pool_size = pool_size
+        self.dns_cache_seconds = dns_cache_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self.timeout_seconds = timeout_seconds
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """共有セッション（未作成・クローズ済みなら作成）"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size,
+                ttl_dns_cache=self.dns_cache_seconds,
+                keepalive_timeout=self.keepalive_seconds,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+                headers={"User-Agent": self.USER_AGENT},
+            )
+        return self._session
+
+    async def warm_up(self, urls: Iterable[str]):
+        """接続先へ事前に接続し、DNS解決とTLSハンドシェイクを済ませておく
+
+        失敗しても翻訳時に改めて接続するだけなので、エラーは無視する。
+        """
+        origins = {f"{parts.scheme}://{parts.netloc}/"
+                   for parts in (urlsplit(url) for url in urls if url)
+                   if parts.scheme and parts.netloc}
+
+        async def touch(origin: str):
+            try:
+                async with self.session.head(origin, allow_redirects=False) as response:
+                    await response.release()
+            except Exception:
+                pass
+
+        if origins:
+            await asyncio.gather(*(touch(origin) for origin in origins))
+
+    async def close(self):
+        """セッションを閉じてプール中の接続を解放"""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
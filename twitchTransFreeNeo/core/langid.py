@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+オフライン言語識別
+文字種ヒストグラム（scripts.py）で候補を絞り込み、同じ文字を使う言語どうしは
+文字n-gram（1〜3文字）のナイーブベイズで判定する。学習用テキストは data/langid/<言語コード>.txt に同梱し、
+初回利用時にプロファイルを構築する。
+"""
+
+import math
+import os
+import re
+import threading
+from collections import Counter
+from operator import add
+from typing import Optional, List, Dict, Tuple
+
+try:
+    from .scripts import ScriptHistogram, classify
+except ImportError:
+    from twitchTransFreeNeo.core.scripts import ScriptHistogram, classify
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "langid")
+
+# 文字種だけで言語が決まるもの（言語, 確信度）
+_SCRIPT_LANGS = {
+    "han": ("zh-CN", 0.8),
+    "greek": ("el", 1.0), "hebrew": ("iw", 1.0), "armenian": ("hy", 1.0),
+    "georgian": ("ka", 1.0), "thai": ("th", 1.0), "lao": ("lo", 1.0),
+    "khmer": ("km", 1.0), "myanmar": ("my", 1.0), "sinhala": ("si", 1.0),
+    "ethiopic": ("am", 1.0), "bengali": ("bn", 0.9), "gujarati": ("gu", 1.0),
+    "tamil": ("ta", 1.0), "telugu": ("te", 1.0), "kannada": ("kn", 1.0),
+    "malayalam": ("ml", 1.0),
+}
+
+# プロファイルのない言語のうち、同じ文字を使い取り違えやすいもの（判定結果 → 取り違えうる言語）
+# 例: ウルドゥー語はペルシア語、スロバキア語はチェコ語、ブルガリア語はロシア語と判定されやすい
+_CONFUSABLE_LANGS = {
+    "ar": ("ur", "ps", "sd"), "fa": ("ur", "ps", "sd"),
+    "hi": ("mr", "ne"),
+    "id": ("ms", "jw", "su"),
+    "iw": ("yi",),
+    "cs": ("sk",),
+    "ru": ("bg", "mk", "sr", "be", "kk", "ky", "mn", "tg"),
+    "uk": ("be",),
+    "es": ("ca", "gl"), "pt": ("ca", "gl"),
+}
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+
+def _ngrams(text: str, max_n: int) -> List[str]:
+    """単語ごとに前後へ空白を付けた1〜max_n文字のn-gram"""
+    grams = []
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f" {word} "
+        length = len(padded)
+        for n in range(1, max_n + 1):
+            grams.extend(padded[i:i + n] for i in range(length - n + 1) if padded[i:i + n] != " ")
+    return grams
+
+
+class _ScriptModel:
+    """同じ文字種を使う言語群のn-gramモデル"""
+
+    def __init__(self, corpora: Dict[str, str], max_n: int, alpha: float):
+        self.langs = sorted(corpora)
+        counts = {lang: Counter(_ngrams(text, max_n)) for lang, text in corpora.items()}
+        vocabulary = set().union(*counts.values())
+        totals = {lang: sum(counter.values()) for lang, counter in counts.items()}
+        denominators = [totals[lang] + alpha * len(vocabulary) for lang in self.langs]
+
+        # n-gram → 言語ごとの対数確率（出現しないn-gramは unseen を使う）
+        self.unseen = tuple(math.log(alpha / d) for d in denominators)
+        self.table = {
+            gram: tuple(math.log((counts[lang][gram] + alpha) / d)
+                        for lang, d in zip(self.langs, denominators))
+            for gram in vocabulary
+        }
+
+    def score(self, grams: List[str]) -> List[float]:
+        """言語ごとの対数尤度"""
+        scores = [0.0] * len(self.langs)
+        table, unseen = self.table, self.unseen
+        for gram in grams:
+            scores = list(map(add, scores, table.get(gram, unseen)))
+        return scores
+
+
+class LanguageIdentifier:
+    """同梱プロファイルによるオフライン言語識別
+
+    identify()は (言語コード, 確信度0〜1) を返す。確信度が低い場合、呼び出し側は
+    リモートの言語検出を併用する。
+    """
+
+    MAX_N = 3
+    ALPHA = 0.5
+    # 1 n-gramあたりの対数尤度差を確率に変換するときの鋭さ
+    SHARPNESS = 12.0
+    # この文字数未満の短文は確信度を割り引く
+    MIN_LETTERS = 6
+    # プロファイルのない言語と取り違えうる判定結果の確信度の上限（リモート検出に回す）
+    CONFUSABLE_CONFIDENCE = 0.5
+
+    _shared: Optional["LanguageIdentifier"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, data_dir: str = DATA_DIR):
+        corpora_by_script: Dict[str, Dict[str, str]] = {}
+        for filename in sorted(os.listdir(data_dir)):
+            if not filename.endswith(".txt"):
+                continue
+            with open(os.path.join(data_dir, filename), encoding="utf-8") as f:
+                text = f.read()
+            script = classify(text).dominant()
+            if script:
+                corpora_by_script.setdefault(script, {})[filename[:-4]] = text
+        self.models = {
+            script: _ScriptModel(corpora, self.MAX_N, self.ALPHA)
+            for script, corpora in corpora_by_script.items()
+        }
+        profiled = set(self.languages)
+        self._confusable = {
+            lang for lang, others in _CONFUSABLE_LANGS.items() if any(other not in profiled for other in others)
+        }
+
+    @classmethod
+    def shared(cls) -> "LanguageIdentifier":
+        """プロセス内で共有するインスタンス（初回にプロファイルを構築）"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @classmethod
+    def loaded(cls) -> Optional["LanguageIdentifier"]:
+        """構築済みの共有インスタンス（未構築ならNone。ここでは構築しない）"""
+        return cls._shared
+
+    @property
+    def languages(self) -> List[str]:
+        """n-gramプロファイルを持つ言語"""
+        return sorted(lang for model in self.models.values() for lang in model.langs)
+
+    @property
+    def supported_languages(self) -> List[str]:
+        """識別できる言語（n-gramプロファイルを持つ言語と、文字種だけで決まる言語）"""
+        script_langs = {lang for lang, _ in _SCRIPT_LANGS.values()}
+        return sorted(set(self.languages) | script_langs | {"ja", "ko"})
+
+    def rank(self, text: str, histogram: Optional[ScriptHistogram] = None) -> List[Tuple[str, float]]:
+        """候補言語を確率の高い順に返す
+
+        同じ文字を使うプロファイルのない言語と取り違えうる言語（ウルドゥー語に対するペルシア語など）は、
+        確信度をCONFUSABLE_CONFIDENCEまでに抑える。
+
+        Args:
+            histogram: 呼び出し側で求め済みの文字種ヒストグラム（省略時はここで求める）
+        """
+        if histogram is None:
+            histogram = classify(text)
+        if not histogram.letters:
+            return []
+
+        # 仮名・ハングルが含まれていれば、漢字の量に関係なく日本語・韓国語
+        if histogram.has_kana:
+            return [("ja", 1.0)]
+        if histogram.has("hangul"):
+            return [("ko", 1.0)]
+
+        script = histogram.dominant()
+        model = self.models.get(script)
+        if model is None:
+            lang = _SCRIPT_LANGS.get(script)
+            return [self._cap(*lang)] if lang else []
+        if len(model.langs) == 1:
+            return [self._cap(model.langs[0], 0.9)]
+
+        grams = _ngrams(text, self.MAX_N)
+        if not grams:
+            return []
+        scores = model.score(grams)
+        best = max(scores)
+        weights = [math.exp((s - best) / len(grams) * self.SHARPNESS) for s in scores]
+        total = sum(weights)
+
+        damping = min(1.0, histogram.letters / self.MIN_LETTERS)
+        ranked = sorted(
+            (self._cap(lang, weight / total * damping) for lang, weight in zip(model.langs, weights)),
+            key=lambda item: item[1], reverse=True
+        )
+        return ranked
+
+    def _cap(self, lang: str, confidence: float) -> Tuple[str, float]:
+        """プロファイルのない言語と取り違えうる場合は確信度を抑える"""
+        if lang in self._confusable:
+            return lang, min(confidence, self.CONFUSABLE_CONFIDENCE)
+        return lang, confidence
+
+    def identify(self, text: str, histogram: Optional[ScriptHistogram] = None) -> Tuple[Optional[str], float]:
+        """最も可能性の高い言語と確信度"""
+        ranked = self.rank(text, histogram)
+        if not ranked:
+            return None, 0.0
+        return ranked[0]
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+翻訳エンジンごとの同時実行数制限と適応的レート制限
+同時実行数をセマフォで抑え、送信レートをトークンバケットで制御する。
+429・5xx応答を受けたらレートを半分に下げ（Retry-Afterがあればその時間は送信を止め）、
+成功が続けば少しずつ上げる（AIMD）。制限中のリクエストは失敗させずに待たせる。
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, Callable, Awaitable
+
+
+class ThrottledError(RuntimeError):
+    """翻訳先から送信を抑えるよう求められた（429・5xx）"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-Afterヘッダー（秒数またはHTTP日付）を待ち秒数に変換"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def check_response(status: int, headers: Any, engine: str):
+    """429・5xxならThrottledErrorを送出する"""
+    if status == 429 or status >= 500:
+        raise ThrottledError(
+            f"{engine}のリクエストが制限されました ({status})",
+            parse_retry_after(headers.get("Retry-After")),
+        )
+
+
+class AdaptiveRateLimiter:
+    """翻訳エンジン1つ分の同時実行数制限とAIMDトークンバケット
+
+    rate_per_secondは初期レートで、429・5xxを受けるまでは成功ごとに
+    初期レートのMAX_RATE_FACTOR倍まで引き上げる。
+    イベントループに紐づくため、翻訳サービスのループからのみ使用する。
+    """
+
+    # 429・5xxを受けたときにレートへ掛ける係数
+    DECREASE_FACTOR = 0.5
+    # 成功1回ごとに上げるレート（件/秒）
+    ADDITIVE_INCREASE = 0.1
+    # 初期レートに対するレートの上限の倍率
+    MAX_RATE_FACTOR = 10.0
+    # Retry-Afterがない場合の待ち時間（再試行ごとに倍）
+    BACKOFF_SECONDS = 1.0
+    MAX_BACKOFF_SECONDS = 30.0
+
+    def __init__(self, name: str, max_concurrency: int = 4, rate_per_second: float = 5.0,
+                 min_rate: float = 0.2, max_retries: int = 3):
+        self.name = name
+        self.rate = max(rate_per_second, min_rate)
+        self.min_rate = min_rate
+        self.max_rate = self.rate * self.MAX_RATE_FACTOR
+        self.max_retries = max_retries
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._bucket_lock = asyncio.Lock()
+        self._tokens = max(1.0, self.rate)
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+
+        # メトリクス
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.requests = 0
+        self.throttle_events = 0
+        self.retries = 0
+        self.failures = 0
+        self.wait_seconds = 0.0
+
+    async def call(self, request: Callable[[], Awaitable[Any]]) -> Any:
+        """制限内でrequestを実行し、429・5xxの場合は待ってから再試行する
+
+        Raises:
+            ThrottledError: 再試行回数を超えても制限が解けなかった場合
+        """
+        attempt = 0
+        while True:
+            await self._acquire()
+            try:
+                result = await request()
+            except ThrottledError as e:
+                self._semaphore.release()
+                self._on_throttled(e.retry_after, attempt)
+                if attempt >= self.max_retries:
+                    self.failures += 1
+                    raise
+                attempt += 1
+                self.retries += 1
+                continue
+            except BaseException:
+                self._semaphore.release()
+                raise
+            self._semaphore.release()
+            self._on_success()
+            return result
+
+    async def _acquire(self):
+        """同時実行枠とトークンを得るまで待つ"""
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        started = time.monotonic()
+        try:
+            await self._semaphore.acquire()
+            try:
+                # ロックで順番を保ち、先に並んだリクエストから送る
+                async with self._bucket_lock:
+                    await self._take_token()
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self.queue_depth -= 1
+            self.wait_seconds += time.monotonic() - started
+        self.requests += 1
+
+    async def _take_token(self):
+        """トークンバケットから1つ取り出す"""
+        while True:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                await asyncio.sleep(self._blocked_until - now)
+                continue
+            capacity = max(1.0, self.rate)
+            self._tokens = min(capacity, self._tokens + (now - self._refilled_at) * self.rate)
+            self._refilled_at = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+    def _on_success(self):
+        self.rate = min(self.max_rate, self.rate + self.ADDITIVE_INCREASE)
+
+    def _on_throttled(self, retry_after: Optional[float], attempt: int):
+        self.throttle_events += 1
+        self.rate = max(self.min_rate, self.rate * self.DECREASE_FACTOR)
+        self._tokens = min(self._tokens, 0.0)
+        if retry_after is None:
+            retry_after = min(self.MAX_BACKOFF_SECONDS, self.BACKOFF_SECONDS * 2 ** attempt)
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        print(f"{self.name}: 送信が制限されました。{retry_after:.1f}秒待機し、"
+              f"レートを{self.rate:.2f}件/秒に下げます")
+
+    def stats(self) -> Dict[str, Any]:
+        """統計情報"""
+        return {
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'requests': self.requests,
+            'throttle_events': self.throttle_events,
+            'retries': self.retries,
+            'failures': self.failures,
+            'rate_per_second': round(self.rate, 2),
+            'average_wait_ms': round(self.wait_seconds / self.requests * 1000, 1) if self.requests else 0.0,
+        }
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+翻訳エンジンの障害検知と振り分け
+エンジンごとのサーキットブレーカーで、失敗が続いた・応答が遅いエンジンへの送信を
+一定時間止め、その後は1件だけ試して（ハーフオープン）回復を確認する。
+応答時間の指数移動平均（EWMA）を記録し、ユーザーの優先順位の範囲内で
+速いエンジンへ振り分ける。
+"""
+
+import time
+from collections import deque
+from typing import Optional, List, Dict, Any
+
+
+class CircuitBreaker:
+    """翻訳エンジン1つ分のサーキットブレーカー
+
+    closed: 通常どおり送信する
+    open: 送信しない（open_seconds経過後にハーフオープンへ）
+    half_open: 1件だけ試し、成功すればclosed、失敗すればopenに戻す
+    disabled: 認証エラー・利用上限など、待っても回復しない理由で送信しない（設定変更まで）
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    DISABLED = "disabled"
+
+    # 応答時間の移動平均で直近の応答に掛ける重み
+    EWMA_ALPHA = 0.3
+    # パーセンタイル計算に使う直近の応答時間の件数と、計算に必要な最低件数
+    LATENCY_SAMPLES = 100
+    MIN_SAMPLES = 10
+
+    def __init__(self, name: str, failure_threshold: int = 5, slow_seconds: float = 5.0,
+                 open_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.slow_seconds = slow_seconds
+        self.open_seconds = open_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.latency: Optional[float] = None
+        self._samples = deque(maxlen=self.LATENCY_SAMPLES)
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self.trips = 0
+        self.disabled_reason: Optional[str] = None
+
+    def available(self) -> bool:
+        """今このエンジンへ送信してよいか（状態は変えない）"""
+        now = time.monotonic()
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.DISABLED:
+            return False
+        if self.state == self.OPEN:
+            return now - self._opened_at >= self.open_seconds
+        # 試行中のリクエストが応答しないまま時間が経った場合は、もう1件試す
+        return self._probe_started is None or now - self._probe_started >= self.open_seconds
+
+    def acquire(self) -> bool:
+        """送信を開始する（openから時間が経っていればハーフオープンにして試行枠を取る）"""
+        if not self.available():
+            return False
+        if self.state != self.CLOSED:
+            self.state = self.HALF_OPEN
+            self._probe_started = time.monotonic()
+        return True
+
+    def record_success(self, latency: float):
+        """成功と応答時間を記録"""
+        if self.state == self.DISABLED:
+            return
+        self.consecutive_failures = 0
+        self._samples.append(latency)
+        if self.state == self.HALF_OPEN:
+            # 回復を確認したので、障害中の平均は引き継がない
+            self.state = self.CLOSED
+            self._probe_started = None
+            self.latency = latency
+            print(f"{self.name}: 応答が回復しました")
+            return
+        self._update_latency(latency)
+
+    def record_abandoned(self, elapsed: float):
+        """応答を待たずに取り消したリクエストの経過時間を記録
+
+        実際の応答時間はelapsed以上という下限しか分からないため、現在の推定値を超えた場合だけ
+        推定を引き上げる方向に使う（先着した応答だけで計算するとp95・平均が低く偏るが、
+        すぐに取り消した短い経過時間を計測値として平均すると逆に大きく下がる）。
+        成否の判定には使わない。
+        """
+        if self.state == self.DISABLED or self.latency is None:
+            return
+        p95 = self.percentile(0.95)
+        if elapsed > (p95 if p95 is not None else self.latency):
+            self._samples.append(elapsed)
+        if elapsed > self.latency:
+            self._update_latency(elapsed)
+
+    def _update_latency(self, latency: float):
+        """応答時間の移動平均を更新し、遅すぎれば送信を止める"""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.EWMA_ALPHA * (latency - self.latency)
+        if self.state == self.CLOSED and 0 < self.slow_seconds < self.latency:
+            self._trip(f"応答が遅いため（平均{self.latency:.1f}秒）")
+
+    def percentile(self, q: float) -> Optional[float]:
+        """直近の応答時間のパーセンタイル（計測が少ない場合はNone）"""
+        if len(self._samples) < self.MIN_SAMPLES:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def record_failure(self):
+        """失敗を記録"""
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN:
+            self._trip("回復を確認できなかったため")
+        elif self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self._trip(f"{self.consecutive_failures}回続けて失敗したため")
+
+    def disable(self, reason: str):
+        """待っても回復しない理由で送信を止める（ハーフオープンの試行もしない）"""
+        if self.state == self.DISABLED:
+            return
+        self.state = self.DISABLED
+        self._probe_started = None
+        self.disabled_reason = reason
+        print(f"{self.name}: {reason}。設定を変更するまで送信を停止します")
+
+    def _trip(self, reason: str):
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probe_started = None
+        self.trips += 1
+        print(f"{self.name}: {reason}、{self.open_seconds:g}秒間送信を停止します")
+
+    def stats(self) -> Dict[str, Any]:
+        """統計情報"""
+        p95 = self.percentile(0.95)
+        return {
+            'state': self.state,
+            'latency_ms': round(self.latency * 1000) if self.latency is not None else None,
+            'p95_ms': round(p95 * 1000) if p95 is not None else None,
+            'consecutive_failures': self.consecutive_failures,
+            'trips': self.trips,
+            'disabled_reason': self.disabled_reason,
+        }
+
+
+class EngineRouter:
+    """優先順位・障害状態・応答時間から送信先のエンジンを選ぶ
+
+    最優先の使用可能なエンジンを基本とし、latency_routingが有効な場合に限り、
+    その平均応答時間が最速のエンジンのlatency_factor倍を超えたら速いエンジンへ振り分ける
+    （既定では無効。ユーザーが選んだエンジンは停止中でない限り置き換えない）。
+    振り分け中もREFRESH_EVERY件に1件は優先エンジンへ送り、平均応答時間を更新する。
+    """
+
+    REFRESH_EVERY = 20
+
+    def __init__(self, engines: List[str], failure_threshold: int = 5, slow_seconds: float = 5.0,
+                 open_seconds: float = 30.0, latency_routing: bool = False, latency_factor: float = 2.0):
+        self.breakers = {
+            engine: CircuitBreaker(engine, failure_threshold, slow_seconds, open_seconds)
+            for engine in engines
+        }
+        self.latency_routing = latency_routing
+        self.latency_factor = latency_factor
+        self._rerouted = 0
+
+    def choose(self, preference: List[str]) -> str:
+        """送信先のエンジン（preferenceは使用できるエンジンを優先順に並べたもの）
+
+        すべて停止中の場合は、メッセージを落とさないよう最優先のエンジンを返す
+        （無効化されたエンジンは除く）。
+        """
+        candidates = [engine for engine in preference if self.breakers[engine].available()]
+        if not candidates:
+            enabled = [engine for engine in preference if self.breakers[engine].state != CircuitBreaker.DISABLED]
+            return (enabled or preference)[0]
+
+        chosen = candidates[0]
+        if self.latency_routing:
+            measured = [engine for engine in candidates if self.breakers[engine].latency is not None]
+            if measured:
+                fastest = min(measured, key=lambda engine: self.breakers[engine].latency)
+                preferred_latency = self.breakers[chosen].latency
+                if (preferred_latency is not None
+                        and preferred_latency > self.breakers[fastest].latency * self.latency_factor):
+                    self._rerouted += 1
+                    if self._rerouted % self.REFRESH_EVERY:
+                        chosen = fastest
+        self.breakers[chosen].acquire()
+        return chosen
+
+    def choose_fallback(self, preference: List[str]) -> Optional[str]:
+        """予備の送信先（使用可能なエンジンがなければNone）"""
+        for engine in preference:
+            if self.breakers[engine].acquire():
+                return engine
+        return None
+
+    def record_success(self, engine: str, latency: float):
+        self.breakers[engine].record_success(latency)
+
+    def record_failure(self, engine: str):
+        self.breakers[engine].record_failure()
+
+    def record_abandoned(self, engine: str, elapsed: float):
+        self.breakers[engine].record_abandoned(elapsed)
+
+    def disable(self, engine: str, reason: str):
+        self.breakers[engine].disable(reason)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """エンジンごとの状態と平均応答時間"""
+        return {engine: breaker.stats() for engine, breaker in self.breakers.items()}
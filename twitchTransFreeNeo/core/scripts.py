@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Unicode文字種の分類
+BMPの全コードポイントについて文字種IDを引ける64KBの表を事前に作り、
+1回の走査でメッセージの文字種ヒストグラムを求める。
+言語検出（ローカル識別・CJKの補正・フォールバック）は同じヒストグラムを使い回す。
+"""
+
+from collections import Counter
+from typing import Dict, Optional
+
+# 文字種名（インデックスが文字種ID。0は分類対象外、1は数字）
+SCRIPT_NAMES = (
+    "other", "digit",
+    "latin", "greek", "cyrillic", "armenian", "hebrew", "arabic",
+    "devanagari", "bengali", "gujarati", "tamil", "telugu", "kannada",
+    "malayalam", "sinhala", "thai", "lao", "myanmar", "georgian",
+    "hangul", "ethiopic", "khmer", "hiragana", "katakana", "han",
+)
+SCRIPT_IDS = {name: index for index, name in enumerate(SCRIPT_NAMES)}
+OTHER = SCRIPT_IDS["other"]
+DIGIT = SCRIPT_IDS["digit"]
+
+# (開始, 終了, 文字種) のコードポイント範囲
+_SCRIPT_RANGES = (
+    (0x0030, 0x0039, "digit"), (0xFF10, 0xFF19, "digit"),
+    (0x0041, 0x005A, "latin"), (0x0061, 0x007A, "latin"),
+    (0x00C0, 0x00D6, "latin"), (0x00D8, 0x00F6, "latin"),
+    (0x00F8, 0x024F, "latin"), (0x1E00, 0x1EFF, "latin"),
+    (0xFF21, 0xFF3A, "latin"), (0xFF41, 0xFF5A, "latin"),
+    (0x0370, 0x03FF, "greek"), (0x0400, 0x052F, "cyrillic"),
+    (0x0530, 0x058F, "armenian"), (0x0590, 0x05FF, "hebrew"),
+    (0x0600, 0x06FF, "arabic"), (0x0750, 0x077F, "arabic"),
+    (0xFB50, 0xFDFF, "arabic"), (0xFE70, 0xFEFF, "arabic"),
+    (0x0900, 0x097F, "devanagari"), (0x0980, 0x09FF, "bengali"),
+    (0x0A80, 0x0AFF, "gujarati"), (0x0B80, 0x0BFF, "tamil"),
+    (0x0C00, 0x0C7F, "telugu"), (0x0C80, 0x0CFF, "kannada"),
+    (0x0D00, 0x0D7F, "malayalam"), (0x0D80, 0x0DFF, "sinhala"),
+    (0x0E00, 0x0E7F, "thai"), (0x0E80, 0x0EFF, "lao"),
+    (0x1000, 0x109F, "myanmar"), (0x10A0, 0x10FF, "georgian"),
+    (0x1100, 0x11FF, "hangul"), (0x3130, 0x318F, "hangul"),
+    (0xAC00, 0xD7AF, "hangul"), (0x1200, 0x137F, "ethiopic"),
+    (0x1780, 0x17FF, "khmer"), (0x3040, 0x309F, "hiragana"),
+    (0x30A0, 0x30FF, "katakana"), (0x31F0, 0x31FF, "katakana"),
+    (0xFF66, 0xFF9F, "katakana"), (0x3400, 0x4DBF, "han"),
+    (0x4E00, 0x9FFF, "han"), (0xF900, 0xFAFF, "han"),
+)
+
+
+def _build_table() -> bytes:
+    """コードポイント（BMP）→ 文字種IDの表"""
+    table = bytearray(0x10000)
+    for start, end, name in _SCRIPT_RANGES:
+        table[start:end + 1] = bytes([SCRIPT_IDS[name]]) * (end - start + 1)
+    return bytes(table)
+
+
+_TABLE = _build_table()
+
+
+class ScriptHistogram:
+    """メッセージ1件分の文字種ごとの文字数"""
+
+    __slots__ = ("_counts", "letters")
+
+    def __init__(self, counts: Dict[int, int]):
+        self._counts = counts
+        # 数字・記号・空白などを除いた文字数（分類表にない文字種の文字は含まない）
+        self.letters = sum(n for script_id, n in counts.items() if script_id > DIGIT)
+
+    def count(self, name: str) -> int:
+        """指定した文字種の文字数"""
+        return self._counts.get(SCRIPT_IDS[name], 0)
+
+    def has(self, name: str) -> bool:
+        """指定した文字種を含むか"""
+        return SCRIPT_IDS[name] in self._counts
+
+    @property
+    def has_kana(self) -> bool:
+        """ひらがな・カタカナを含むか"""
+        return self.has("hiragana") or self.has("katakana")
+
+    def dominant(self) -> Optional[str]:
+        """最も多い文字種（数字・記号のみならNone）
+
+        ひらがなとカタカナは合わせて "kana" として数える。
+        """
+        totals: Dict[str, int] = {}
+        for script_id, n in self._counts.items():
+            if script_id > DIGIT:
+                name = SCRIPT_NAMES[script_id]
+                if name in ("hiragana", "katakana"):
+                    name = "kana"
+                totals[name] = totals.get(name, 0) + n
+        return max(totals, key=totals.get) if totals else None
+
+    def as_dict(self) -> Dict[str, int]:
+        """{文字種名: 文字数}"""
+        return {SCRIPT_NAMES[script_id]: n for script_id, n in self._counts.items()}
+
+    def __repr__(self) -> str:
+        return f"ScriptHistogram({self.as_dict()})"
+
+
+def classify(text: str) -> ScriptHistogram:
+    """テキストを1回走査して文字種ヒストグラムを作る"""
+    try:
+        counts = Counter(map(_TABLE.__getitem__, map(ord, text)))
+    except IndexError:
+        # BMP外の文字（絵文字など）を含む場合
+        counts = Counter(_TABLE[code] if code < 0x10000 else OTHER for code in map(ord, text))
+    counts.pop(OTHER, None)
+    return ScriptHistogram(counts)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+長いメッセージの文・節への分割
+"hello from Brazil! love the stream!" のように定型句を組み合わせたメッセージを
+文（または節）ごとに分け、区切りの空白を保持したまま翻訳結果を組み立て直せるようにする。
+"""
+
+import re
+from typing import List, Tuple
+
+# 文末: 英文の終止符の連続（閉じ括弧・引用符を含む）の後に空白が続く位置、またはCJKの句点
+_SENTENCE_END = r"[.!?…‼⁉]+[\"')\]]*(?=\s)|[。！？]+[」』）]*"
+# 節の区切り: 空白が続くカンマ・セミコロン、またはCJKの読点
+_CLAUSE_END = r"[,;](?=\s)|[、，；]"
+
+_SENTENCE_RE = re.compile(f"({_SENTENCE_END})(\\s*)")
+_CLAUSE_RE = re.compile(f"({_SENTENCE_END}|{_CLAUSE_END})(\\s*)")
+
+
+def split_segments(text: str, clauses: bool = False) -> List[Tuple[str, str]]:
+    """テキストを (区間, 後続の区切り文字列) のリストに分割する
+
+    区間の末尾の句読点は区間に含める。文字・数字を含まない区間（"..." のみなど）は
+    直前の区間に連結する。区間と区切りを順に連結すると、前後の空白を除いた元のテキストに戻る。
+
+    Args:
+        clauses: 文末に加えて、カンマ・読点などの節の区切りでも分割する
+    """
+    segments: List[List[str]] = []
+    start = 0
+    text = text.strip()
+    for match in (_CLAUSE_RE if clauses else _SENTENCE_RE).finditer(text):
+        _append(segments, text[start:match.end(1)], match.group(2))
+        start = match.end()
+    if start < len(text):
+        _append(segments, text[start:], "")
+    return [(segment, separator) for segment, separator in segments]
+
+
+def _append(segments: List[List[str]], segment: str, separator: str):
+    """区間を追加（文字・数字を含まない区間は直前の区間に連結する）"""
+    if segments and not any(char.isalnum() for char in segment):
+        segments[-1][0] += segments[-1][1] + segment
+        segments[-1][1] = separator
+    elif segments and not any(char.isalnum() for char in segments[-1][0]):
+        # 先頭が記号のみの場合は次の区間に連結する
+        previous = segments.pop()
+        segments.append([previous[0] + previous[1] + segment, separator])
+    else:
+        segments.append([segment, separator])
+
+
+def join_segments(translations: List[str], separators: List[str]) -> str:
+    """翻訳した区間を元の区切り文字列で連結する"""
+    return "".join(translation + separator for translation, separator in zip(translations, separators)).strip()
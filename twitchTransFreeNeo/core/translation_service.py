@@ -0,0 +1,568 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+翻訳サービス
+Twitch・YouTubeの両モニターで共有する翻訳キャッシュ・翻訳エンジン・TTSキューを
+1プロセスに1つだけ保持し、専用スレッドのイベントループ上で翻訳処理を実行する
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Any, Optional, Awaitable, Set, TypeVar
+
+try:
+    from .translator import TranslationEngine, LanguageDetector
+    from .database import TranslationDatabase
+    from .tts import TTSEngine
+    from .cache import NegativeCache, KeyNormalizer
+    from .fuzzy import FuzzyMatcher
+    from .segments import split_segments, join_segments
+    from .scripts import ScriptHistogram, classify
+    from .langid import LanguageIdentifier
+except ImportError:
+    from twitchTransFreeNeo.core.translator import TranslationEngine, LanguageDetector
+    from twitchTransFreeNeo.core.database import TranslationDatabase
+    from twitchTransFreeNeo.core.tts import TTSEngine
+    from twitchTransFreeNeo.core.cache import NegativeCache, KeyNormalizer
+    from twitchTransFreeNeo.core.fuzzy import FuzzyMatcher
+    from twitchTransFreeNeo.core.segments import split_segments, join_segments
+    from twitchTransFreeNeo.core.scripts import ScriptHistogram, classify
+    from twitchTransFreeNeo.core.langid import LanguageIdentifier
+
+T = TypeVar('T')
+
+
+class TranslationResult:
+    """翻訳パイプラインの結果
+
+    scriptsには言語検出に使った文字種ヒストグラムを保持し、呼び出し側
+    （TTSなど）で文字種を数え直さずに済むようにする。
+    engineには実際に応答した翻訳エンジンを保持する（キャッシュから返した場合はNone）。
+    """
+
+    def __init__(self, detected_lang: str, target_lang: str, translation: str, from_cache: bool = False,
+                 scripts: Optional[ScriptHistogram] = None, engine: Optional[str] = None):
+        self.detected_lang = detected_lang
+        self.target_lang = target_lang
+        self.translation = translation
+        self.from_cache = from_cache
+        self.scripts = scripts
+        self.engine = engine
+
+
+class TranslationService:
+    """モニター間で共有する翻訳サービス
+
+    acquire()で参照を取得し、release()で手放す。最後の参照が手放されると
+    書き込み待ちの翻訳を反映し、DB接続・TTS・イベントループを停止する。
+    チャットが途切れている間に、古い翻訳のクリーンアップを実行する。
+    """
+
+    SHUTDOWN_TIMEOUT = 5.0
+    MAX_SEGMENTS = 8  # これより多くの文に分かれるメッセージは分割せずに翻訳する
+    MAINTENANCE_INTERVAL = 30.0  # アイドル判定の間隔（秒）
+    CLEANUP_INTERVAL = 6 * 3600  # 期間指定クリーンアップの最小実行間隔（秒）
+
+    _instance: Optional["TranslationService"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = dict(config)
+        self.translator = TranslationEngine(self.config)
+        self.language_detector = LanguageDetector(self.config)
+        self.database = TranslationDatabase(
+            cache_max_entries=self.config.get("translation_cache_max_entries", 5000),
+            cache_max_bytes=self.config.get("translation_cache_max_bytes", 4194304),
+            flush_interval_ms=self.config.get("translation_cache_flush_interval_ms", 500),
+            flush_max_rows=self.config.get("translation_cache_flush_max_rows", 50),
+            key_normalizer=KeyNormalizer(
+                nfkc=self.config.get("translation_cache_key_nfkc", True),
+                casefold=self.config.get("translation_cache_key_casefold", True),
+                collapse_repeats=self.config.get("translation_cache_key_collapse_repeats", 3),
+                trim_punctuation=self.config.get("translation_cache_key_trim_punctuation", True),
+            ),
+            fuzzy_matcher=self._fuzzy_matcher(self.config),
+        )
+        self.negative_cache = NegativeCache(
+            max_entries=self.config.get("translation_negative_cache_max_entries", 10000),
+            ttl_seconds=self.config.get("translation_negative_cache_ttl_seconds", 600),
+        )
+        self.tts_engine = TTSEngine(self.config)
+
+        self._ref_count = 0
+        self._stats_lock = threading.Lock()
+        self.home_fast_path_skips = 0  # 母語と判定して通信せずに打ち切った件数
+        self.segmented_messages = 0  # 文ごとに分けて翻訳したメッセージ数
+        self.segment_lookups = 0  # キャッシュを参照した文の数
+        self.segment_hits = 0  # キャッシュにあり翻訳を省いた文の数
+        self.segment_chars_saved = 0  # キャッシュにあり翻訳を省いた文字数
+        self._last_activity = time.monotonic()
+        self._last_cleanup: Optional[float] = None
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._active_messages: Set[asyncio.Task] = set()  # 翻訳処理中のメッセージ（エンジンの入れ替え用）
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="TranslationService", daemon=True
+        )
+        self._thread.start()
+        self._loop.call_soon_threadsafe(self._start_maintenance)
+        self.tts_engine.start()
+
+    @staticmethod
+    def _fuzzy_matcher(config: Dict[str, Any]) -> FuzzyMatcher:
+        """設定からあいまい検索の設定を作る"""
+        return FuzzyMatcher(
+            enabled=config.get("translation_fuzzy_match", False),
+            languages=config.get("translation_fuzzy_langs", []),
+            threshold=config.get("translation_fuzzy_threshold", 0.8),
+            max_edits=config.get("translation_fuzzy_max_edits", 2),
+            min_length=config.get("translation_fuzzy_min_length", 20),
+        )
+
+    @classmethod
+    def acquire(cls, config: Dict[str, Any]) -> "TranslationService":
+        """共有サービスへの参照を取得（未起動なら起動）"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(config)
+            cls._instance._ref_count += 1
+            return cls._instance
+
+    @classmethod
+    def current(cls) -> Optional["TranslationService"]:
+        """起動中の共有サービス（未起動ならNone）"""
+        return cls._instance
+
+    def release(self):
+        """参照を手放す（書き込み待ちは毎回反映し、最後の参照なら停止）"""
+        with self._instance_lock:
+            self._ref_count -= 1
+            last = self._ref_count <= 0
+            if last and TranslationService._instance is self:
+                TranslationService._instance = None
+
+        if last:
+            self._shutdown()
+        else:
+            self._run_sync(self.database.flush())
+
+    def _run_loop(self):
+        """サービス用イベントループ（専用スレッド）"""
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    def _run_sync(self, coro: Awaitable[T]) -> Optional[T]:
+        """サービスのループでコルーチンを実行し、完了を同期的に待つ"""
+        if not self._thread.is_alive():
+            coro.close()
+            return None
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout=self.SHUTDOWN_TIMEOUT)
+        except Exception as e:
+            print(f"翻訳サービス処理エラー: {e}")
+            future.cancel()
+            return None
+
+    async def submit(self, coro: Awaitable[T]) -> T:
+        """呼び出し元のループからサービスのループへ処理を投入して結果を待つ"""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._loop))
+
+    def _start_maintenance(self):
+        """定期メンテナンスを開始し、翻訳先へ事前接続する（サービスのループで呼ばれる）
+
+        キーの正規化設定が変わっていれば、ここでキャッシュのキーの再計算を始める
+        （GUIスレッドで行うサービスの作成を待たせないため）。
+        """
+        self._maintenance_task = self._loop.create_task(self._maintenance_loop())
+        self._loop.create_task(self.database.rekey())
+        self._loop.create_task(self.translator.connect())
+
+    def _is_idle(self) -> bool:
+        """チャットが一定時間途切れているか"""
+        idle_seconds = self.config.get("translation_cache_idle_seconds", 60)
+        return time.monotonic() - self._last_activity >= idle_seconds
+
+    async def _maintenance_loop(self):
+        """アイドル時にあいまい検索の索引を作り、古い翻訳を少しずつ削除する"""
+        while True:
+            await asyncio.sleep(self.MAINTENANCE_INTERVAL)
+            if not self._is_idle() or self.database.rekeying:
+                continue
+            if self.database.fuzzy_matcher.enabled and self.database.needs_fuzzy_backfill:
+                indexed = await self.database.backfill_fuzzy_index(
+                    should_continue=lambda: self._is_idle() and self.database.fuzzy_matcher.enabled
+                )
+                if indexed and self.config.get("debug", False):
+                    print(f"翻訳キャッシュ: {indexed}件をあいまい検索の索引に登録しました")
+            keep_days = self.config.get("translation_cache_keep_days", 30)
+            if keep_days <= 0 or not self._is_idle():
+                continue
+            now = time.monotonic()
+            if self._last_cleanup is not None and now - self._last_cleanup < self.CLEANUP_INTERVAL:
+                continue
+            self._last_cleanup = now
+            removed = await self.database.cleanup_old_translations(keep_days, should_continue=self._is_idle)
+            if removed and self.config.get("debug", False):
+                print(f"翻訳キャッシュ: {keep_days}日間使われていない翻訳を{removed}件削除しました")
+
+    async def _close_async(self):
+        """メンテナンスを止め、書き込み待ちを反映してDB接続を閉じる"""
+        task, self._maintenance_task = self._maintenance_task, None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.translator.close()
+        await self.database.close()
+
+    async def _retire_translator(self, translator: TranslationEngine):
+        """設定変更で置き換えた翻訳エンジンを、処理中の翻訳が終わってから閉じる
+
+        処理中のメッセージは置き換え前のエンジンを使い続けるため、すぐに閉じると
+        HTTPセッション・スレッドプールが途中で失われる。最大SHUTDOWN_TIMEOUT秒待つ。
+        """
+        deadline = self._loop.time() + self.SHUTDOWN_TIMEOUT
+        if self._active_messages:
+            await asyncio.wait(set(self._active_messages), timeout=self.SHUTDOWN_TIMEOUT)
+        await translator.drain(max(0.0, deadline - self._loop.time()))
+        await translator.close()
+
+    def _shutdown(self):
+        """書き込み待ちを反映してDB接続・TTS・ループを停止"""
+        self._run_sync(self._close_async())
+        self.tts_engine.stop()
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=self.SHUTDOWN_TIMEOUT)
+        # ループが応答しなかった場合もDB接続だけは確実に手放す
+        self.database.close_nowait()
+
+    def update_config(self, new_config: Dict[str, Any]):
+        """設定更新
+
+        両モニターが同じ設定をそれぞれ転送してくるため、内容が変わらない場合は何もしない
+        （翻訳エンジンを作り直すとサーキットブレーカー・レート制御・応答時間の状態が失われる）。
+        """
+        previous_config = dict(self.config)
+        self.config.update(new_config)
+        if self.config == previous_config:
+            return
+        old_translator = self.translator
+        self.translator = TranslationEngine(self.config, counters=old_translator.counters)
+        if self._thread.is_alive():
+            # 古いエンジンは処理中の翻訳が終わってから解放し、新しいエンジンで事前接続する
+            asyncio.run_coroutine_threadsafe(self._retire_translator(old_translator), self._loop)
+            asyncio.run_coroutine_threadsafe(self.translator.connect(), self._loop)
+        self.language_detector = LanguageDetector(self.config)
+        # 索引の構成は固定のため、あいまい検索の条件はその場で切り替えられる
+        self.database.fuzzy_matcher = self._fuzzy_matcher(self.config)
+        # スキップ判定は翻訳先・無視言語の設定に依存するため破棄する
+        self.negative_cache.clear()
+        self.tts_engine.update_config(new_config)
+
+    def should_skip_locally(self, cleaned_content: str, histogram: Optional[ScriptHistogram] = None) -> bool:
+        """明らかに母語で、翻訳しても捨てられるだけのメッセージか（呼び出し元のスレッドで実行）
+
+        母語の投稿を翻訳しない設定のときだけ、文字種ヒストグラムとオフライン識別で
+        母語と確信できるメッセージ（例: 仮名を含む → ja）をサービスへ渡す前に打ち切る。
+        言語識別プロファイルはサービスのループで起動時に構築し、構築が済むまでは判定しない。
+
+        Args:
+            histogram: 呼び出し側で求め済みの文字種ヒストグラム（省略時はここで求める）
+        """
+        if not self.config.get("home_fast_path", True) or not self.config.get("local_langid_enabled", True):
+            return False
+        identifier = LanguageIdentifier.loaded()
+        if identifier is None:
+            return False
+        language_detector = self.language_detector
+        if not language_detector.drops_home_language():
+            return False
+
+        # 言語指定（"en:..."）がある場合は翻訳の意図があるため対象外
+        target_lang_override, _ = language_detector.extract_target_language_from_text(cleaned_content)
+        if target_lang_override:
+            return False
+
+        lang, confidence = identifier.identify(cleaned_content, histogram or classify(cleaned_content))
+        home_lang = self.config.get("lang_trans_to_home", "ja")
+        if not lang or confidence < self.config.get("home_fast_path_confidence", 0.95):
+            return False
+        if not LanguageDetector.langs_match(lang, home_lang):
+            return False
+
+        with self._stats_lock:
+            self.home_fast_path_skips += 1
+        if self.config.get("debug", False):
+            print(f"母語のため翻訳スキップ({lang}, {confidence:.2f}): {cleaned_content[:30]}...")
+        return True
+
+    def get_local_stats(self) -> Dict[str, int]:
+        """通信せずに処理した件数（省いたリモート呼び出しの内訳）"""
+        with self._stats_lock:
+            home_fast_path = self.home_fast_path_skips
+        counters = self.translator.counters
+        return {
+            'home_fast_path': home_fast_path,
+            'local_detections': counters['local_detections'],
+            'coalesced': counters['coalesced'],
+            'remote_calls_saved': home_fast_path + counters['local_detections'] + counters['coalesced'],
+        }
+
+    def get_segment_stats(self) -> Dict[str, Any]:
+        """文ごとのキャッシュ参照の件数（メッセージ全体のキャッシュとは別に集計）"""
+        with self._stats_lock:
+            lookups = self.segment_lookups
+            return {
+                'messages': self.segmented_messages,
+                'lookups': lookups,
+                'hits': self.segment_hits,
+                'hit_rate': round(self.segment_hits / lookups, 4) if lookups else 0.0,
+                'chars_saved': self.segment_chars_saved,
+            }
+
+    def get_rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """翻訳エンジンごとの送信待ち件数・制限回数など"""
+        return self.translator.rate_limit_stats()
+
+    def get_hedge_stats(self) -> Dict[str, Any]:
+        """ヘッジ送信の回数・時間切れで破棄した件数・エンジンごとの応答件数"""
+        counters = self.translator.counters
+        return {
+            'hedged': counters['hedged'],
+            'hedge_wins': counters['hedge_wins'],
+            'budget_exceeded': counters['budget_exceeded'],
+            'answered': {key[len('answered_'):]: n for key, n in counters.items() if key.startswith('answered_')},
+        }
+
+    def get_executor_stats(self) -> Dict[str, int]:
+        """翻訳エンジン専用スレッドプールの実行中スレッド数・待機件数"""
+        return self.translator.executor_stats()
+
+    def get_engine_health(self) -> Dict[str, Dict[str, Any]]:
+        """翻訳エンジンごとの稼働状態（サーキットブレーカー）と平均応答時間"""
+        return self.translator.engine_health_stats()
+
+    async def translate_message(self, cleaned_content: str,
+                                histogram: Optional[ScriptHistogram] = None) -> Optional[TranslationResult]:
+        """言語検出・翻訳先決定・キャッシュ参照・翻訳を行う（サービスのループで実行）
+
+        Args:
+            histogram: 呼び出し側で求め済みのcleaned_contentの文字種ヒストグラム
+                （省略時、または言語指定を除いてテキストが変わる場合はここで求める）
+
+        Returns:
+            TranslationResult: 翻訳不要・失敗の場合はNone
+        """
+        self._last_activity = time.monotonic()
+        # 設定変更で置き換えた翻訳エンジンは、処理中のメッセージが終わるまで閉じない
+        task = asyncio.current_task()
+        self._active_messages.add(task)
+        task.add_done_callback(self._active_messages.discard)
+        translator = self.translator
+        language_detector = self.language_detector
+
+        # 翻訳不要と判定済みのメッセージは言語検出の前に打ち切る
+        skip_reason = self.negative_cache.get(cleaned_content)
+        if skip_reason:
+            if self.config.get("debug", False):
+                print(f"翻訳スキップ（{skip_reason}）: {cleaned_content[:30]}...")
+            return None
+
+        # 言語指定確認
+        target_lang_override, text_to_translate = language_detector.extract_target_language_from_text(cleaned_content)
+
+        # 文字種の分類（言語検出・結果で共有）
+        if histogram is not None and not target_lang_override:
+            scripts = histogram
+        else:
+            scripts = classify(text_to_translate or cleaned_content)
+        if not scripts.letters and not any(ch.isalpha() for ch in text_to_translate or cleaned_content):
+            # 数字・記号のみ（「888」「!!!」など）は翻訳しない
+            # 分類表にない文字種（チベット文字など）は文字数に数えられないため、isalphaで確かめる
+            self.negative_cache.put(cleaned_content, "no_letters")
+            return None
+
+        if self.config.get("single_pass_translation", False):
+            return await self._translate_single_pass(cleaned_content, target_lang_override, text_to_translate, scripts)
+
+        # 言語検出
+        detected_lang = await translator.detect_language(text_to_translate or cleaned_content, scripts)
+
+        if not detected_lang:
+            return None
+
+        # 無視言語チェック
+        if language_detector.should_ignore_language(detected_lang):
+            self.negative_cache.put(cleaned_content, "ignored_language")
+            return None
+
+        # 翻訳先言語決定
+        if target_lang_override:
+            target_lang = target_lang_override
+            final_text = text_to_translate
+        else:
+            target_lang = language_detector.determine_target_language(detected_lang, cleaned_content)
+            final_text = cleaned_content
+
+        # 同じ言語なら翻訳不要（pt と pt-BR などの地域バリアントも同一扱い）
+        if LanguageDetector.langs_match(detected_lang, target_lang):
+            self.negative_cache.put(cleaned_content, "same_language")
+            return None
+
+        # データベースから既訳語チェック（両プラットフォームで共有）
+        cached_translation = await self.database.get_translation(final_text, target_lang)
+
+        if cached_translation:
+            return TranslationResult(detected_lang, target_lang, cached_translation, from_cache=True, scripts=scripts)
+
+        # 文ごとにキャッシュを参照し、ない文だけを翻訳
+        if self.config.get("translation_segment_cache", False):
+            result = await self._translate_segments(cleaned_content, final_text, detected_lang, target_lang, scripts)
+            if result is not None:
+                return result
+
+        # 翻訳実行
+        translated_text, engine = await translator.translate_text_with_engine(
+            final_text, target_lang, detected_lang
+        ) or (None, None)
+        return await self._finish_translation(cleaned_content, final_text, detected_lang, target_lang,
+                                              translated_text, scripts, engine)
+
+    async def _translate_single_pass(self, cleaned_content: str, target_lang_override: str,
+                                     text_to_translate: str, scripts: ScriptHistogram) -> Optional[TranslationResult]:
+        """言語検出と翻訳を1回のリクエストで行う（翻訳元=auto）
+
+        ローカルの簡易判定で翻訳先を仮決めして翻訳し、応答に含まれる翻訳元言語で
+        改めて翻訳先を決める。仮決めが外れた場合のみ正しい翻訳先で翻訳し直す。
+        キャッシュにある翻訳は通信せずに返す。
+        """
+        translator = self.translator
+        language_detector = self.language_detector
+
+        guessed_lang = translator.guess_language(text_to_translate or cleaned_content, scripts)
+        if target_lang_override:
+            target_lang = target_lang_override
+            final_text = text_to_translate
+        else:
+            target_lang = language_detector.determine_target_language(guessed_lang or "", cleaned_content)
+            final_text = cleaned_content
+
+        cached_translation = await self.database.get_translation(final_text, target_lang)
+        if cached_translation:
+            return TranslationResult(guessed_lang or "", target_lang, cached_translation, from_cache=True,
+                                     scripts=scripts)
+
+        result = await translator.translate_text_with_detection(final_text, target_lang)
+        if not result:
+            return None
+        translated_text, detected_lang, engine = result
+        detected_lang = detected_lang or guessed_lang
+        if not detected_lang:
+            return None
+
+        # 無視言語チェック
+        if language_detector.should_ignore_language(detected_lang):
+            self.negative_cache.put(cleaned_content, "ignored_language")
+            return None
+
+        # 検出結果で翻訳先を確定
+        if not target_lang_override:
+            actual_target = language_detector.determine_target_language(detected_lang, cleaned_content)
+            if actual_target != target_lang and not LanguageDetector.langs_match(detected_lang, actual_target):
+                target_lang = actual_target
+                cached_translation = await self.database.get_translation(final_text, target_lang)
+                if cached_translation:
+                    return TranslationResult(detected_lang, target_lang, cached_translation, from_cache=True,
+                                             scripts=scripts)
+                translated_text, engine = await translator.translate_text_with_engine(
+                    final_text, target_lang, detected_lang
+                ) or (None, None)
+
+        # 同じ言語なら翻訳結果を破棄
+        if LanguageDetector.langs_match(detected_lang, target_lang):
+            self.negative_cache.put(cleaned_content, "same_language")
+            return None
+
+        return await self._finish_translation(cleaned_content, final_text, detected_lang, target_lang,
+                                              translated_text, scripts, engine)
+
+    async def _translate_segments(self, cleaned_content: str, final_text: str, detected_lang: str,
+                                  target_lang: str, scripts: ScriptHistogram) -> Optional[TranslationResult]:
+        """メッセージを文（設定により節）に分け、キャッシュにない文だけを翻訳して組み立てる
+
+        キャッシュにない文は同時に投入し、バッチャーで1回のリクエストにまとめる。
+        翻訳した文とメッセージ全体の翻訳はそれぞれキャッシュに保存する。
+        どの文もキャッシュにない場合は分割しない（バッチできないエンジンではリクエストが文の数だけ増え、
+        文をまたいだ文脈も失われるため）。
+
+        Returns:
+            TranslationResult: 分割できない・キャッシュにある文がない・文の翻訳に失敗した場合はNone
+            （メッセージ全体を翻訳する）
+        """
+        if len(final_text) < self.config.get("translation_segment_min_length", 30):
+            return None
+        segments = split_segments(final_text, clauses=self.config.get("translation_segment_clauses", False))
+        if not 2 <= len(segments) <= self.MAX_SEGMENTS:
+            return None
+
+        texts = [segment for segment, _ in segments]
+        cached = await asyncio.gather(*(self.database.get_translation(text, target_lang) for text in texts))
+        missing = [i for i, translation in enumerate(cached) if not translation]
+        with self._stats_lock:
+            self.segment_lookups += len(texts)
+            if len(missing) == len(texts):
+                return None
+            self.segmented_messages += 1
+            self.segment_hits += len(texts) - len(missing)
+            self.segment_chars_saved += sum(len(texts[i]) for i, translation in enumerate(cached) if translation)
+
+        translated = await asyncio.gather(*(
+            self.translator.translate_text_with_engine(texts[i], target_lang, detected_lang) for i in missing
+        ))
+        pieces = list(cached)
+        engine = None
+        for i, result in zip(missing, translated):
+            if not result or not result[0].strip():
+                return None
+            pieces[i] = result[0]
+            engine = engine or result[1]
+            await self.database.save_translation(texts[i], result[0], target_lang, engine=result[1])
+
+        translated_text = join_segments(pieces, [separator for _, separator in segments])
+        if not missing:
+            # すべての文がキャッシュにあった場合は通信なし
+            await self.database.save_translation(final_text, translated_text, target_lang)
+            return TranslationResult(detected_lang, target_lang, translated_text, from_cache=True, scripts=scripts)
+        if self.config.get("debug", False):
+            print(f"文ごとの翻訳: {len(texts)}文中{len(texts) - len(missing)}文をキャッシュから使用")
+        return await self._finish_translation(cleaned_content, final_text, detected_lang, target_lang,
+                                              translated_text, scripts, engine)
+
+    async def _finish_translation(self, cleaned_content: str, final_text: str, detected_lang: str,
+                                  target_lang: str, translated_text: Optional[str],
+                                  scripts: ScriptHistogram, engine: Optional[str]) -> Optional[TranslationResult]:
+        """新しい翻訳結果を保存して返す（空の結果はネガティブキャッシュに記録）"""
+        if not translated_text or not translated_text.strip():
+            # 通信エラー等（None）は再試行の余地があるため、空の結果だけを記録する
+            if translated_text is not None:
+                self.negative_cache.put(cleaned_content, "empty_translation")
+            return None
+
+        # データベースに保存
+        await self.database.save_translation(final_text, translated_text, target_lang, engine=engine)
+        return TranslationResult(detected_lang, target_lang, translated_text, scripts=scripts, engine=engine)
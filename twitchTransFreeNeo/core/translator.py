@@ -2,37 +2,233 @@
 # -*- coding: utf-8 -*-
 
 import asyncio
-import aiohttp
-from typing import Optional, Dict, Any
+import json
+import time
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable, Hashable
+from bs4 import BeautifulSoup
 from deep_translator import GoogleTranslator
-import deepl
+from deep_translator.exceptions import TooManyRequests
+
+try:
+    from .http_client import HTTPClient
+    from .deepl_client import DeepLClient, DeepLError, DeepLAuthorizationError, DeepLQuotaExceededError
+    from .executor import BoundedExecutor
+    from .batching import TranslationBatcher
+    from .langid import LanguageIdentifier
+    from .scripts import ScriptHistogram, classify
+    from .cache import normalize_text
+    from .rate_limit import AdaptiveRateLimiter, ThrottledError, check_response
+    from .routing import EngineRouter
+except ImportError:
+    from twitchTransFreeNeo.core.http_client import HTTPClient
+    from twitchTransFreeNeo.core.deepl_client import (
+        DeepLClient, DeepLError, DeepLAuthorizationError, DeepLQuotaExceededError
+    )
+    from twitchTransFreeNeo.core.executor import BoundedExecutor
+    from twitchTransFreeNeo.core.batching import TranslationBatcher
+    from twitchTransFreeNeo.core.langid import LanguageIdentifier
+    from twitchTransFreeNeo.core.scripts import ScriptHistogram, classify
+    from twitchTransFreeNeo.core.cache import normalize_text
+    from twitchTransFreeNeo.core.rate_limit import AdaptiveRateLimiter, ThrottledError, check_response
+    from twitchTransFreeNeo.core.routing import EngineRouter
 
 class TranslationEngine:
     """翻訳エンジン統合クラス"""
 
-    def __init__(self, config: Dict[str, Any]):
+    ENGINES = ("google", "deepl", "gas")
+
+    GOOGLE_TRANSLATE_URL = "https://translate.google.com/m"
+    # リモート検出が失敗したとき、ローカル識別の結果を採用する最低確信度
+    LOCAL_FALLBACK_CONFIDENCE = 0.5
+    # 翻訳元言語を含むJSONを返すエンドポイント（1パスモード用）
+    GOOGLE_API_URL = "https://translate.googleapis.com/translate_a/single"
+
+    def __init__(self, config: Dict[str, Any], counters: Optional[Dict[str, int]] = None):
         self.config = config
+        # 通信を省いた件数（設定変更でエンジンを作り直しても引き継ぐ）
+        self.counters = counters if counters is not None else {
+            'local_detections': 0, 'coalesced': 0, 'hedged': 0, 'hedge_wins': 0, 'budget_exceeded': 0,
+        }
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
         self.google_available = False
         self.deepl_translator = None
+        self.executor = BoundedExecutor(
+            "TranslationEngine", max_workers=config.get("translation_executor_workers", 4)
+        )
+        self.http = HTTPClient(
+            pool_size=config.get("http_pool_size", 10),
+            dns_cache_seconds=config.get("http_dns_cache_seconds", 300),
+        )
+        self.batcher = TranslationBatcher(
+            self._translate_many,
+            window_ms=config.get("translation_batch_window_ms", 20),
+            max_items=config.get("translation_batch_max_items", 16),
+        )
+        self.detect_batcher = TranslationBatcher(
+            self._translate_many_with_detection,
+            window_ms=config.get("translation_batch_window_ms", 20),
+            max_items=config.get("translation_batch_max_items", 16),
+        )
+        self.limiters = {
+            engine: AdaptiveRateLimiter(
+                engine,
+                max_concurrency=config.get(f"{engine}_max_concurrency", 2 if engine == "deepl" else 4),
+                rate_per_second=config.get(f"{engine}_rate_per_second", 5.0),
+                max_retries=config.get("translation_throttle_retries", 3),
+            )
+            for engine in self.ENGINES
+        }
+        self.router = EngineRouter(
+            list(self.ENGINES),
+            failure_threshold=config.get("engine_failure_threshold", 5),
+            slow_seconds=config.get("engine_slow_seconds", 5.0),
+            open_seconds=config.get("engine_open_seconds", 30.0),
+            latency_routing=config.get("engine_latency_routing", False),
+            latency_factor=config.get("engine_latency_factor", 2.0),
+        )
         self._init_translators()
 
+    async def connect(self):
+        """翻訳先への接続を事前に確立（接続時のウォームアップ）"""
+        if self.config.get("local_langid_enabled", True):
+            # 言語識別プロファイルの構築を最初のメッセージより前に済ませる
+            await self.executor.run(LanguageIdentifier.shared)
+        urls = [self.GOOGLE_TRANSLATE_URL]
+        if self.config.get("single_pass_translation", False):
+            urls.append(self.GOOGLE_API_URL)
+        if self.config.get("gas_url"):
+            urls.append(self.config["gas_url"])
+        if self.deepl_translator:
+            urls.append(self.deepl_translator.base_url)
+        await self.http.warm_up(urls)
+
+    async def close(self):
+        """プール中の接続とスレッドプールを解放"""
+        await self.http.close()
+        self.executor.shutdown()
+
+    async def drain(self, timeout: float):
+        """実行中の翻訳・言語検出が終わるまで待つ（最大timeout秒）"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self._inflight:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.wait(list(self._inflight.values()), timeout=remaining)
+
     def _init_translators(self):
         """翻訳エンジンを初期化"""
         try:
             # Google Translator（deep-translatorは毎回インスタンスを作成するため、利用可能フラグのみ保持）
             self.google_available = True
 
-            # DeepL Translator（APIキーがある場合のみ）
+            # DeepL（APIキーがある場合のみ、共有HTTPクライアントで呼び出す）
             deepl_api_key = self.config.get("deepl_api_key", "")
             if deepl_api_key:
-                self.deepl_translator = deepl.Translator(deepl_api_key)
+                self.deepl_translator = DeepLClient(deepl_api_key, self.http)
         except Exception as e:
             print(f"翻訳エンジン初期化エラー: {e}")
             self.google_available = False
             self.deepl_translator = None
     
-    async def detect_language(self, text: str) -> Optional[str]:
-        """言語検出 (deep-translatorを使用)"""
+    async def _run_in_thread(self, engine: str, func: Callable, *args, **kwargs) -> Any:
+        """同期APIを専用スレッドプールで呼び出す（エンジンの同時実行数・レート制限内で）"""
+        async def request():
+            try:
+                return await self.executor.run(func, *args, **kwargs)
+            except TooManyRequests as e:
+                raise ThrottledError(f"{engine}のリクエストが制限されました: {e}") from e
+        return await self._call_engine(engine, request)
+
+    async def _call_engine(self, engine: str, request: Callable[[], Awaitable[Any]]) -> Any:
+        """エンジンの送信制限内でリクエストし、成否と応答時間をサーキットブレーカーに記録
+
+        未対応の言語など、リクエスト側に原因のあるエラー（429以外の4xx）はエンジンの障害として数えない。
+        認証エラー・利用上限は待っても回復しないため、エンジンを無効化する。
+        """
+        async def timed():
+            started = time.monotonic()
+            try:
+                result = await request()
+            except ThrottledError:
+                # 送信制限はレート制御で吸収するため、再試行しきれなかった場合のみ失敗とする
+                raise
+            except (DeepLAuthorizationError, DeepLQuotaExceededError) as e:
+                self.router.disable(engine, str(e))
+                raise
+            except DeepLError as e:
+                if e.status is None or not 400 <= e.status < 500:
+                    self.router.record_failure(engine)
+                raise
+            except Exception:
+                self.router.record_failure(engine)
+                raise
+            self.router.record_success(engine, time.monotonic() - started)
+            return result
+
+        try:
+            return await self.limiters[engine].call(timed)
+        except ThrottledError:
+            self.router.record_failure(engine)
+            raise
+
+    def rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """エンジンごとの送信待ち・制限の統計"""
+        return {engine: limiter.stats() for engine, limiter in self.limiters.items()}
+
+    def executor_stats(self) -> Dict[str, int]:
+        """専用スレッドプールの実行中・待機中の件数"""
+        return self.executor.stats()
+
+    def engine_health_stats(self) -> Dict[str, Dict[str, Any]]:
+        """エンジンごとのサーキットブレーカーの状態と平均応答時間"""
+        return self.router.stats()
+
+    def _identify_locally(self, text: str, histogram: ScriptHistogram) -> Tuple[Optional[str], float]:
+        """オフライン言語識別（無効な場合は (None, 0.0)）"""
+        if not self.config.get("local_langid_enabled", True):
+            return None, 0.0
+        return LanguageIdentifier.shared().identify(text, histogram)
+
+    async def detect_language(self, text: str, histogram: Optional[ScriptHistogram] = None) -> Optional[str]:
+        """言語検出（オフライン識別 → 確信度が低ければdeep-translator）
+
+        Args:
+            histogram: 呼び出し側で求め済みの文字種ヒストグラム（省略時はここで求める）
+        """
+        if histogram is None:
+            histogram = classify(text)
+        local_lang, confidence = self._identify_locally(text, histogram)
+        if local_lang and confidence >= self.config.get("local_langid_threshold", 0.8):
+            self.counters['local_detections'] += 1
+            if self.config.get("debug", False):
+                print(f"言語検出結果(ローカル): {text[:30]}... → {local_lang} ({confidence:.2f})")
+            return local_lang
+
+        return await self._single_flight(
+            ("detect", normalize_text(text)),
+            lambda: self._detect_remotely(text, histogram, local_lang, confidence)
+        )
+
+    async def _single_flight(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """同じキーの処理が実行中ならその結果を待ち、なければ新たに実行する
+
+        待機側がキャンセルされても共有中の処理は止めない。
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.counters['coalesced'] += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(factory())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _detect_remotely(self, text: str, histogram: ScriptHistogram,
+                               local_lang: Optional[str], confidence: float) -> Optional[str]:
+        """リモートの言語検出（失敗時はローカルの推定結果）"""
         try:
             from deep_translator import single_detection
 
@@ -45,10 +241,10 @@ class TranslationEngine:
                 return None
 
             # deep-translatorのsingle_detection機能を使用
-            detected = await asyncio.to_thread(single_detection, text, api_key=None)
+            detected = await self.executor.run(single_detection, text, api_key=None)
 
             # CJK言語の検証（APIの誤検出を補正）
-            detected = self._validate_cjk_detection(text, detected)
+            detected = self._validate_cjk_detection(histogram, detected)
 
             if self.config.get("debug", False):
                 print(f"言語検出結果: {text[:30]}... → {detected}")
@@ -56,95 +252,291 @@ class TranslationEngine:
             return detected if detected else None
         except Exception as e:
             print(f"言語検出エラー: {e}")
-            # フォールバック: 簡易的な言語推定
-            return self._fallback_detect_language(text)
+            # フォールバック: ローカル識別がある程度確かならその結果、なければ簡易的な言語推定
+            if local_lang and confidence >= self.LOCAL_FALLBACK_CONFIDENCE:
+                return local_lang
+            return self._fallback_detect_language(histogram)
+
+    def guess_language(self, text: str, histogram: Optional[ScriptHistogram] = None) -> Optional[str]:
+        """通信せずに言語を推定（1パスモードで翻訳先を仮決めする用途）"""
+        if histogram is None:
+            histogram = classify(text)
+        local_lang, confidence = self._identify_locally(text, histogram)
+        if local_lang and confidence >= self.LOCAL_FALLBACK_CONFIDENCE:
+            return local_lang
+        return self._fallback_detect_language(histogram)
 
-    def _validate_cjk_detection(self, text: str, detected: str) -> str:
+    @staticmethod
+    def _validate_cjk_detection(histogram: ScriptHistogram, detected: str) -> str:
         """CJK言語検出の検証・補正"""
         if not detected:
             return detected
 
-        # ひらがな・カタカナの有無をチェック
-        has_hiragana = any('\u3040' <= c <= '\u309f' for c in text)
-        has_katakana = any('\u30a0' <= c <= '\u30ff' for c in text)
-        has_cjk = any('\u4e00' <= c <= '\u9fff' for c in text)
-
         # 日本語と判定されたが、ひらがな・カタカナがない場合
-        if detected == 'ja' and has_cjk and not has_hiragana and not has_katakana:
+        if detected == 'ja' and histogram.has("han") and not histogram.has_kana:
             # CJK文字のみ = 中国語の可能性が高い
             return 'zh-CN'
 
         # 中国語と判定されたが、ひらがな・カタカナがある場合
-        if detected in ['zh-CN', 'zh-TW', 'zh'] and (has_hiragana or has_katakana):
+        if detected in ['zh-CN', 'zh-TW', 'zh'] and histogram.has_kana:
             return 'ja'
 
         return detected
 
-    def _fallback_detect_language(self, text: str) -> Optional[str]:
-        """フォールバック言語検出（ヒューリスティクス）"""
-        try:
-            # 各言語の文字カウント
-            has_hiragana = any('\u3040' <= c <= '\u309f' for c in text)
-            has_katakana = any('\u30a0' <= c <= '\u30ff' for c in text)
-            has_cjk = any('\u4e00' <= c <= '\u9fff' for c in text)
-            has_hangul = any('\uac00' <= c <= '\ud7af' or '\u1100' <= c <= '\u11ff' for c in text)
-
-            # 日本語: ひらがな or カタカナが含まれている
-            if has_hiragana or has_katakana:
-                return 'ja'
-
-            # 韓国語: ハングル文字が含まれている
-            if has_hangul:
-                return 'ko'
-
-            # CJK文字のみ（ひらがな・カタカナなし）= 中国語の可能性が高い
-            if has_cjk:
-                return 'zh-CN'
-
-            # 非ASCII文字の検出（その他の言語）
-            # キリル文字（ロシア語等）
-            if any('\u0400' <= c <= '\u04ff' for c in text):
-                return 'ru'
-
-            # アラビア文字
-            if any('\u0600' <= c <= '\u06ff' for c in text):
-                return 'ar'
-
-            # タイ文字
-            if any('\u0e00' <= c <= '\u0e7f' for c in text):
-                return 'th'
-
-            # デバナーガリー文字（ヒンディー語等）
-            if any('\u0900' <= c <= '\u097f' for c in text):
-                return 'hi'
-
-            # ラテン文字ベースの言語は区別が困難なため英語をデフォルトに
-            return 'en'
-        except:
-            return None
+    # 文字種から推定する言語（上から順に判定）
+    FALLBACK_SCRIPT_LANGS = (
+        ("hangul", "ko"),  # ハングル文字が含まれている
+        ("han", "zh-CN"),  # CJK文字のみ（ひらがな・カタカナなし）= 中国語の可能性が高い
+        ("cyrillic", "ru"),  # キリル文字（ロシア語等）
+        ("arabic", "ar"),  # アラビア文字
+        ("thai", "th"),  # タイ文字
+        ("devanagari", "hi"),  # デバナーガリー文字（ヒンディー語等）
+    )
+
+    def _fallback_detect_language(self, histogram: ScriptHistogram) -> Optional[str]:
+        """フォールバック言語検出（文字種ヒストグラムによるヒューリスティクス）"""
+        # 日本語: ひらがな or カタカナが含まれている
+        if histogram.has_kana:
+            return 'ja'
+
+        for script, lang in self.FALLBACK_SCRIPT_LANGS:
+            if histogram.has(script):
+                return lang
+
+        # ラテン文字ベースの言語は区別が困難なため英語をデフォルトに
+        return 'en'
     
+    def _preferred_engine(self) -> str:
+        """設定上の翻訳エンジン（deepl / google / gas）"""
+        translator_type = self.config.get("translator", "google")
+        if translator_type == "deepl" and self.deepl_translator:
+            return "deepl"
+        elif translator_type == "google":
+            return "google"
+        elif self.config.get("gas_url"):
+            return "gas"
+        return "google"
+
+    def _engine_preference(self) -> List[str]:
+        """使用できる翻訳エンジンの優先順位（設定上のエンジン、Google、DeepL、GASの順）"""
+        available = {
+            "google": True,
+            "deepl": self.deepl_translator is not None,
+            "gas": bool(self.config.get("gas_url")),
+        }
+        preferred = self._preferred_engine()
+        return [preferred] + [engine for engine in ("google", "deepl", "gas")
+                              if engine != preferred and available[engine]]
+
+    def _active_engine(self) -> str:
+        """今回使用する翻訳エンジン（停止中のエンジンを避け、応答の速いものを選ぶ）"""
+        return self.router.choose(self._engine_preference())
+
     async def translate_text(self, text: str, target_lang: str, source_lang: str = "auto") -> Optional[str]:
         """テキスト翻訳"""
+        result = await self.translate_text_with_engine(text, target_lang, source_lang)
+        return result[0] if result else None
+
+    async def translate_text_with_engine(self, text: str, target_lang: str,
+                                         source_lang: str = "auto") -> Optional[Tuple[str, str]]:
+        """テキスト翻訳（同じ翻訳先への翻訳はまとめて送信）し、(翻訳結果, 応答したエンジン) を返す"""
+        # Google翻訳は翻訳元を自動判定するため、翻訳元言語が違っても同じリクエストになる
+        if self._preferred_engine() == "google":
+            source_lang = "auto"
+        immediate = not self._sends_batches()
+        return await self._single_flight(
+            ("translate", normalize_text(text), target_lang, source_lang),
+            lambda: self.batcher.translate(text, target_lang, source_lang, immediate=immediate)
+        )
+
+    def _sends_batches(self) -> bool:
+        """優先エンジンが複数テキストを1リクエストで送れるか
+
+        送れないエンジン（Google翻訳、配列に対応していないGAS）では、まとめても
+        リクエスト数は減らないため待たずに送る（同じテキストはシングルフライトでまとめる）。
+        """
+        engine = self._preferred_engine()
+        return engine == "deepl" or (engine == "gas" and self.config.get("gas_batch", False))
+
+    async def _translate_many(self, texts: List[str], target_lang: str,
+                              source_lang: str) -> List[Optional[Tuple[str, str]]]:
+        """複数テキストをまとめて翻訳（バッチャーから呼ばれる）"""
         try:
             # Google翻訳エンジンが初期化されていない場合は再初期化
             if not self.google_available:
                 self._init_translators()
-                
-            translator_type = self.config.get("translator", "google")
-            
-            if translator_type == "deepl" and self.deepl_translator:
-                return await self._translate_with_deepl(text, target_lang, source_lang)
-            elif translator_type == "google":
-                return await self._translate_with_google(text, target_lang)
-            elif self.config.get("gas_url"):
-                return await self._translate_with_gas(text, target_lang, source_lang)
-            else:
-                return await self._translate_with_google(text, target_lang)
-                
+            return await self._run_hedged(
+                texts, lambda engine, batch: self._translate_on(engine, batch, target_lang, source_lang)
+            )
+        except Exception as e:
+            print(f"翻訳エラー: {e}")
+            return [None] * len(texts)
+
+    async def _translate_on(self, engine: str, texts: List[str], target_lang: str,
+                            source_lang: str) -> List[Optional[str]]:
+        """指定したエンジンで翻訳（失敗したテキストはNone）"""
+        if engine == "deepl":
+            if len(texts) == 1:
+                return [await self._translate_with_deepl(texts[0], target_lang, source_lang)]
+            return await self._translate_batch_with_deepl(texts, target_lang, source_lang)
+        elif engine == "gas":
+            if len(texts) == 1:
+                return [await self._translate_with_gas(texts[0], target_lang, source_lang)]
+            return await self._translate_batch_with_gas(texts, target_lang, source_lang)
+        # Google（モバイル版）は1リクエスト1テキストのため、プール上で並行に送る
+        return list(await asyncio.gather(
+            *(self._translate_with_google(text, target_lang) for text in texts)
+        ))
+
+    async def _run_hedged(self, texts: List[str],
+                          run: Callable[[str, List[str]], Awaitable[List[Any]]]) -> List[Optional[Tuple[Any, str]]]:
+        """優先エンジンで実行し、遅い・失敗した場合は次のエンジンにも送って先着の結果を使う
+
+        優先エンジンが応答時間のp95（計測が少ないうちはtranslation_hedge_delay_ms）までに
+        応答しなければ、次のエンジンへ同じテキストを送る（ヘッジ）。失敗したテキストは
+        ヘッジの設定によらず、待たずに次のエンジンへ送る。translation_latency_budget_msを過ぎても結果のない
+        テキストはNoneとし、応答待ちのリクエストは取り消す。取り消したリクエストの経過時間は
+        応答時間の下限としてサーキットブレーカーに記録する。
+
+        Returns:
+            テキストごとの (結果, 応答したエンジン)
+        """
+        loop = asyncio.get_running_loop()
+        preference = self._engine_preference()
+        primary = self._active_engine()
+        others = [engine for engine in preference if engine != primary]
+        hedge_enabled = self.config.get("translation_hedge_enabled", True)
+        hedged = not others
+
+        budget_ms = self.config.get("translation_latency_budget_ms", 6000)
+        deadline = loop.time() + budget_ms / 1000 if budget_ms > 0 else None
+        hedge_delay = self.router.breakers[primary].percentile(0.95)
+        if hedge_delay is None:
+            hedge_delay = self.config.get("translation_hedge_delay_ms", 1500) / 1000
+        hedge_at = loop.time() + hedge_delay
+
+        results: List[Optional[Tuple[Any, str]]] = [None] * len(texts)
+        tasks: Dict[asyncio.Task, Tuple[str, List[int], float]] = {}
+        hedge_engine = None
+
+        def start(engine: str, indices: List[int]):
+            task = loop.create_task(run(engine, [texts[i] for i in indices]))
+            tasks[task] = (engine, indices, loop.time())
+
+        start(primary, list(range(len(texts))))
+        try:
+            while True:
+                missing = [i for i, result in enumerate(results) if result is None]
+                now = loop.time()
+                if not missing or (deadline is not None and now >= deadline):
+                    break
+                if not hedged and (not tasks or (hedge_enabled and now >= hedge_at)):
+                    hedged = True
+                    hedge_engine = self.router.choose_fallback(others)
+                    if hedge_engine is not None:
+                        if tasks:
+                            self.counters['hedged'] += 1
+                        start(hedge_engine, missing)
+                if not tasks:
+                    break
+
+                wake_at = [t for t in (deadline, hedge_at if hedge_enabled and not hedged else None) if t is not None]
+                done, _ = await asyncio.wait(
+                    tasks, timeout=max(0.0, min(wake_at) - now) if wake_at else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    engine, indices, _ = tasks.pop(task)
+                    try:
+                        values = task.result()
+                    except Exception as e:
+                        print(f"翻訳エラー ({engine}): {e}")
+                        continue
+                    for i, value in zip(indices, values):
+                        if value is not None and results[i] is None:
+                            results[i] = (value, engine)
+        finally:
+            # 先着の結果が揃ったら、残りのリクエストは取り消す
+            now = loop.time()
+            for task, (engine, _, started) in tasks.items():
+                task.cancel()
+                self.router.record_abandoned(engine, now - started)
+
+        for result in results:
+            if result is None:
+                continue
+            key = f"answered_{result[1]}"
+            self.counters[key] = self.counters.get(key, 0) + 1
+            if result[1] == hedge_engine:
+                self.counters['hedge_wins'] += 1
+        expired = sum(1 for result in results if result is None)
+        if expired and deadline is not None and loop.time() >= deadline:
+            self.counters['budget_exceeded'] += expired
+            print(f"翻訳が{budget_ms}ms以内に返らなかったため破棄しました ({expired}件)")
+        return results
+
+    async def translate_text_with_detection(self, text: str,
+                                            target_lang: str) -> Optional[Tuple[str, Optional[str], str]]:
+        """翻訳元=autoで翻訳し、(翻訳結果, 検出された翻訳元言語, 応答したエンジン) を返す（失敗時はNone）"""
+        immediate = not self._sends_batches()
+        return await self._single_flight(
+            ("translate_detect", normalize_text(text), target_lang),
+            lambda: self.detect_batcher.translate(text, target_lang, "auto", immediate=immediate)
+        )
+
+    async def _translate_many_with_detection(self, texts: List[str], target_lang: str,
+                                             source_lang: str) -> List[Optional[Tuple[str, Optional[str], str]]]:
+        """複数テキストを翻訳元=autoで翻訳し、翻訳元言語・エンジンとあわせて返す（バッチャーから呼ばれる）"""
+        try:
+            if not self.google_available:
+                self._init_translators()
+            results = await self._run_hedged(
+                texts, lambda engine, batch: self._translate_with_detection_on(engine, batch, target_lang)
+            )
+            return [(result[0][0], result[0][1], result[1]) if result else None for result in results]
         except Exception as e:
             print(f"翻訳エラー: {e}")
+            return [None] * len(texts)
+
+    async def _translate_with_detection_on(self, engine: str, texts: List[str],
+                                           target_lang: str) -> List[Optional[Tuple[str, Optional[str]]]]:
+        """指定したエンジンで翻訳元=autoの翻訳（失敗したテキストはNone）"""
+        if engine == "deepl":
+            return await self._translate_batch_with_deepl_detection(texts, target_lang)
+        elif engine == "gas":
+            # GASの応答には翻訳元言語が含まれないため、言語検出してから翻訳する
+            async def detect_and_translate(text: str):
+                detected = await self.detect_language(text)
+                translated = await self._translate_with_gas(text, target_lang, detected or "auto")
+                return (translated, detected) if translated is not None else None
+            return list(await asyncio.gather(*(detect_and_translate(text) for text in texts)))
+        return list(await asyncio.gather(
+            *(self._translate_with_google_detection(text, target_lang) for text in texts)
+        ))
+
+    async def _translate_with_google_detection(self, text: str, target_lang: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Google翻訳（翻訳元言語つき）"""
+        try:
+            params = {"client": "gtx", "sl": "auto", "tl": target_lang, "dt": "t", "q": text.strip()}
+
+            async def request():
+                async with self.http.session.get(self.GOOGLE_API_URL, params=params) as response:
+                    check_response(response.status, response.headers, "Google翻訳")
+                    if response.status >= 400:
+                        raise RuntimeError(f"Google翻訳のリクエストに失敗しました ({response.status})")
+                    return await response.text()
+            data = json.loads(await self._call_engine("google", request))
+
+            # [[["訳文", "原文", ...], ...], None, "翻訳元言語", ...]
+            translated = "".join(segment[0] for segment in (data[0] or []) if segment and segment[0])
+            detected = data[2] if len(data) > 2 and isinstance(data[2], str) else None
+            if self.config.get("debug", False):
+                print(f"Google翻訳(1パス): {text[:30]}... ({detected}) → {translated[:30]}...")
+            return translated, detected
+        except Exception as e:
+            print(f"Google翻訳エラー: {e}")
             return None
-    
+
     async def _translate_with_google(self, text: str, target_lang: str) -> Optional[str]:
         """Google翻訳 (deep-translatorを使用)"""
         try:
@@ -159,9 +551,11 @@ class TranslationEngine:
             if self.config.get("debug", False):
                 print(f"Google翻訳: {text[:30]}... → {target_lang} に翻訳中...")
 
-            # deep-translatorのGoogleTranslatorを使用
-            translator = GoogleTranslator(source='auto', target=target_lang)
-            result = await asyncio.to_thread(translator.translate, text)
+            result = await self._request_google(text, target_lang)
+            if result is None:
+                # ページ構造が変わった場合などはdeep-translatorにフォールバック
+                translator = GoogleTranslator(source='auto', target=target_lang)
+                result = await self._run_in_thread("google", translator.translate, text)
 
             if self.config.get("debug", False):
                 print(f"Google翻訳結果: {text[:30]}... → {result[:30] if result else 'None'}...")
@@ -175,48 +569,99 @@ class TranslationEngine:
                 traceback.print_exc()
             return None
     
+    async def _request_google(self, text: str, target_lang: str, source_lang: str = "auto") -> Optional[str]:
+        """共有セッションでGoogle翻訳（モバイル版）を呼び出す
+
+        deep-translatorのGoogleTranslatorと同じリクエスト・解析を行う。
+
+        Returns:
+            Optional[str]: 翻訳結果（結果要素が見つからない場合はNone）
+        """
+        text = text.strip()
+        if not text:
+            return text
+        params = {"tl": target_lang, "sl": source_lang, "q": text}
+
+        async def request():
+            async with self.http.session.get(self.GOOGLE_TRANSLATE_URL, params=params) as response:
+                check_response(response.status, response.headers, "Google翻訳")
+                if response.status >= 400:
+                    raise RuntimeError(f"Google翻訳のリクエストに失敗しました ({response.status})")
+                return await response.text()
+        html = await self._call_engine("google", request)
+        return await self.executor.run(self._parse_google_response, html)
+
+    @staticmethod
+    def _parse_google_response(html: str) -> Optional[str]:
+        """Google翻訳（モバイル版）のHTMLから翻訳結果を取り出す"""
+        soup = BeautifulSoup(html, "html.parser")
+        element = soup.find("div", {"class": "t0"}) or soup.find("div", {"class": "result-container"})
+        return element.get_text(strip=True) if element else None
+
     async def _translate_with_deepl(self, text: str, target_lang: str, source_lang: str) -> Optional[str]:
-        """DeepL翻訳"""
+        """DeepL翻訳（失敗時はNoneを返し、他エンジンへの切り替えは呼び出し側で行う）"""
+        return (await self._translate_batch_with_deepl([text], target_lang, source_lang))[0]
+
+    async def _translate_batch_with_deepl(self, texts: List[str], target_lang: str,
+                                          source_lang: str) -> List[Optional[str]]:
+        """DeepL翻訳（複数テキストを1リクエストで翻訳）"""
+        results = await self._request_deepl(texts, target_lang, source_lang)
+        return [result[0] for result in results] if results else [None] * len(texts)
+
+    async def _translate_batch_with_deepl_detection(self, texts: List[str],
+                                                    target_lang: str) -> List[Optional[Tuple[str, Optional[str]]]]:
+        """DeepL翻訳（翻訳元言語つき、複数テキストを1リクエストで翻訳）"""
+        return await self._request_deepl(texts, target_lang) or [None] * len(texts)
+
+    async def _request_deepl(self, texts: List[str], target_lang: str,
+                             source_lang: str = "auto") -> Optional[List[Tuple[str, Optional[str]]]]:
+        """DeepL APIで翻訳し、(翻訳結果, 翻訳元言語) のリストを返す（失敗時はNone）"""
+        if not self.deepl_translator:
+            print("DeepL翻訳エラー: DeepLトランスレーターが初期化されていません")
+            return None
         try:
-            if not self.deepl_translator:
-                print("DeepL翻訳エラー: DeepLトランスレーターが初期化されていません")
-                return await self._translate_with_google(text, target_lang)
-            
-            # DeepL言語コード変換
-            deepl_lang_dict = {
-                'de': 'DE', 'en': 'EN-US', 'fr': 'FR', 'es': 'ES', 
-                'pt': 'PT-PT', 'it': 'IT', 'nl': 'NL', 'pl': 'PL', 
-                'ru': 'RU', 'ja': 'JA', 'zh-CN': 'ZH', 'ko': 'KO'
-            }
-            
-            deepl_target = deepl_lang_dict.get(target_lang, target_lang.upper())
-            deepl_source = None if source_lang == "auto" else deepl_lang_dict.get(source_lang, source_lang.upper())
-            
-            # DeepL APIを正しく使用
-            if deepl_target:
-                # translate_text メソッドを使用
-                result = await asyncio.to_thread(
-                    self.deepl_translator.translate_text,
-                    text,
-                    target_lang=deepl_target,
-                    source_lang=deepl_source
-                )
-                # DeepL APIの結果からテキストを取得
-                if result:
-                    return result.text if hasattr(result, 'text') else str(result)
-                else:
-                    print(f"DeepL翻訳エラー: 結果が空です")
-                    return await self._translate_with_google(text, target_lang)
-            else:
-                # DeepLで対応していない言語はGoogleで翻訳
-                print(f"DeepL翻訳: 対応していない言語 {target_lang}, Googleにフォールバック")
-                return await self._translate_with_google(text, target_lang)
-                
+            results = await self._call_engine(
+                "deepl", lambda: self.deepl_translator.translate(texts, target_lang, source_lang)
+            )
         except Exception as e:
             print(f"DeepL翻訳エラー: {e}")
-            # フォールバック: Google翻訳
-            return await self._translate_with_google(text, target_lang)
-    
+            return None
+        if self.config.get("debug", False):
+            print(f"DeepL翻訳: {len(texts)}件 → {target_lang}")
+        return results
+
+    async def _translate_batch_with_gas(self, texts: List[str], target_lang: str,
+                                        source_lang: str) -> List[Optional[str]]:
+        """Google Apps Script翻訳（配列ペイロード）
+
+        スクリプトが配列に対応していない場合（gas_batch=False、または応答が
+        同じ長さの配列でない場合）は1件ずつ送る。
+        """
+        if self.config.get("gas_batch", False):
+            try:
+                payload = {
+                    "text": texts,
+                    "source": source_lang,
+                    "target": target_lang
+                }
+
+                async def request():
+                    async with self.http.session.post(self.config["gas_url"], json=payload) as response:
+                        check_response(response.status, response.headers, "GAS翻訳")
+                        return await response.text() if response.status == 200 else None
+                body = await self._call_engine("gas", request)
+                if body is not None:
+                    results = json.loads(body)
+                    if isinstance(results, list) and len(results) == len(texts):
+                        return [str(result) if result else None for result in results]
+                print("GAS翻訳: 配列の応答が得られないため1件ずつ翻訳します")
+            except Exception as e:
+                print(f"GAS翻訳エラー: {e}")
+
+        return list(await asyncio.gather(
+            *(self._translate_with_gas(text, target_lang, source_lang) for text in texts)
+        ))
+
     async def _translate_with_gas(self, text: str, target_lang: str, source_lang: str) -> Optional[str]:
         """Google Apps Script翻訳"""
         try:
@@ -230,11 +675,13 @@ class TranslationEngine:
                 "target": target_lang
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(gas_url, json=payload) as response:
+            async def request():
+                async with self.http.session.post(gas_url, json=payload) as response:
+                    check_response(response.status, response.headers, "GAS翻訳")
                     if response.status == 200:
                         return await response.text()
-            return None
+                return None
+            return await self._call_engine("gas", request)
             
         except Exception as e:
             print(f"GAS翻訳エラー: {e}")
@@ -276,6 +723,18 @@ class LanguageDetector:
             return False
         return a_base == b_base
 
+    def drops_home_language(self) -> bool:
+        """母語のメッセージが翻訳されない設定か
+
+        一方向翻訳モード、母語が無視言語に含まれる場合、母語と翻訳先が同じ場合は
+        母語の投稿は必ず同言語ガードか無視言語チェックで捨てられる。
+        """
+        home_lang = self.config.get("lang_trans_to_home", "ja")
+        other_lang = self.config.get("lang_home_to_other", "en")
+        return (self.config.get("trans_to_home_only", False)
+                or self.should_ignore_language(home_lang)
+                or self.langs_match(home_lang, other_lang))
+
     def should_ignore_language(self, lang: str) -> bool:
         """言語を無視すべきかチェック"""
         if not lang:
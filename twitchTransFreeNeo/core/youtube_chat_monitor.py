@@ -31,15 +31,13 @@ except ImportError:
 
 try:
     from .chat_monitor import ChatMessage, MessageProcessor
-    from .translator import TranslationEngine, LanguageDetector
-    from .database import TranslationDatabase
-    from .tts import TTSEngine
+    from .translation_service import TranslationService
+    from .scripts import classify
     from .youtube_auth import YouTubeAuthManager, GOOGLE_AUTH_AVAILABLE
 except ImportError:
     from twitchTransFreeNeo.core.chat_monitor import ChatMessage, MessageProcessor
-    from twitchTransFreeNeo.core.translator import TranslationEngine, LanguageDetector
-    from twitchTransFreeNeo.core.database import TranslationDatabase
-    from twitchTransFreeNeo.core.tts import TTSEngine
+    from twitchTransFreeNeo.core.translation_service import TranslationService
+    from twitchTransFreeNeo.core.scripts import classify
     from twitchTransFreeNeo.core.youtube_auth import YouTubeAuthManager, GOOGLE_AUTH_AVAILABLE
 
 
@@ -54,10 +52,8 @@ class YouTubeChatMonitor:
         self.log_callback = log_callback
         self.quota_callback = quota_callback  # (used, limit) で呼ばれる
         self.processor = MessageProcessor(config)
-        self.translator = TranslationEngine(config)
-        self.language_detector = LanguageDetector(config)
-        self.database = TranslationDatabase()
-        self.tts_engine = TTSEngine(config)
+        # 翻訳キャッシュ・翻訳エンジン・TTSはTwitchモニターと共有（start()で取得）
+        self.service: Optional[TranslationService] = None
 
         self.is_running = False
         self.chat = None
@@ -117,8 +113,9 @@ class YouTubeChatMonitor:
             self.chat = pytchat.create(video_id=self.video_id)
             self.is_running = True
 
-            # TTSエンジンを開始
-            self.tts_engine.start()
+            # 共有翻訳サービスを取得（TTSエンジンもサービス側で開始される）
+            if self.service is None:
+                self.service = TranslationService.acquire(self.config)
 
             # 投稿機能の初期化（認証済みの場合）
             self._init_posting()
@@ -142,6 +139,8 @@ class YouTubeChatMonitor:
             print(f"[ERROR] YouTube監視開始エラー: {e}")
             import traceback
             traceback.print_exc()
+            self.is_running = False
+            self._release_service()
             return False
 
     def _log(self, message: str):
@@ -250,46 +249,23 @@ class YouTubeChatMonitor:
         if not cleaned_content:
             return
 
-        # 言語指定確認
-        target_lang_override, text_to_translate = self.language_detector.extract_target_language_from_text(cleaned_content)
-
-        # 言語検出
-        detected_lang = await self.translator.detect_language(text_to_translate or cleaned_content)
-
-        if not detected_lang:
+        # 言語検出・キャッシュ参照・翻訳（共有の翻訳サービスで実行）
+        service = self.service
+        if not service:
             return
-
-        # 無視言語チェック
-        if self.language_detector.should_ignore_language(detected_lang):
+        # 文字種の分類は1メッセージにつき1回だけ行い、母語判定と翻訳で共有する
+        histogram = classify(cleaned_content)
+        # 明らかに母語で翻訳対象外のメッセージは通信せずに打ち切る
+        if service.should_skip_locally(cleaned_content, histogram):
             return
+        result = await service.submit(service.translate_message(cleaned_content, histogram))
 
-        # 翻訳先言語決定
-        if target_lang_override:
-            target_lang = target_lang_override
-            final_text = text_to_translate
-        else:
-            target_lang = self.language_detector.determine_target_language(detected_lang, cleaned_content)
-            final_text = cleaned_content
-
-        # 同じ言語なら翻訳不要（pt と pt-BR などの地域バリアントも同一扱い）
-        if LanguageDetector.langs_match(detected_lang, target_lang):
+        if not result:
             return
 
-        # データベースから既訳語チェック
-        cached_translation = await self.database.get_translation(final_text, target_lang)
-
-        if cached_translation:
-            translated_text = cached_translation
-        else:
-            # 翻訳実行
-            translated_text = await self.translator.translate_text(final_text, target_lang, detected_lang)
-
-            if translated_text:
-                # データベースに保存
-                await self.database.save_translation(final_text, translated_text, target_lang)
-
-        if not translated_text:
-            return
+        detected_lang = result.detected_lang
+        target_lang = result.target_lang
+        translated_text = result.translation
 
         # 翻訳後も削除単語除去
         for word in self.processor.delete_words:
@@ -401,6 +377,10 @@ class YouTubeChatMonitor:
 
     def _add_tts_messages(self, chat_message: ChatMessage):
         """TTS読み上げメッセージを追加"""
+        service = self.service
+        if not service:
+            return
+
         # TTSが無効の場合は何もしない
         if not self.config.get("tts_enabled", False):
             return
@@ -415,13 +395,13 @@ class YouTubeChatMonitor:
         if self.config.get("tts_in", False):
             tts_text = self._format_tts_text(chat_message, is_input=True)
             if tts_text:
-                self.tts_engine.put(tts_text, chat_message.lang)
+                service.tts_engine.put(tts_text, chat_message.lang)
 
         # 出力テキスト読み上げ
         if self.config.get("tts_out", False):
             tts_text = self._format_tts_text(chat_message, is_input=False)
             if tts_text:
-                self.tts_engine.put(tts_text, chat_message.target_lang)
+                service.tts_engine.put(tts_text, chat_message.target_lang)
 
     def _format_tts_text(self, chat_message: ChatMessage, is_input: bool = True) -> str:
         """TTS用のテキストをフォーマット"""
@@ -458,9 +438,6 @@ class YouTubeChatMonitor:
         print("[INFO] YouTube Live チャット監視を停止中...")
         self.is_running = False
 
-        if hasattr(self, 'tts_engine'):
-            self.tts_engine.stop()
-
         if self.chat:
             try:
                 self.chat.terminate()
@@ -468,12 +445,21 @@ class YouTubeChatMonitor:
                 print(f"[WARNING] pytchat終了時エラー: {e}")
             self.chat = None
 
+        # 共有翻訳サービスを手放す（書き込み待ちの翻訳を反映、最後の利用者ならTTSも停止）
+        self._release_service()
+
         print("[INFO] YouTube Live チャット監視を停止しました")
 
+    def _release_service(self):
+        """共有翻訳サービスへの参照を手放す"""
+        service, self.service = self.service, None
+        if service:
+            service.release()
+
     def update_config(self, config: Dict[str, Any]):
         """設定を更新"""
         self.config = config
         self.processor = MessageProcessor(config)
-        self.translator = TranslationEngine(config)
-        self.language_detector = LanguageDetector(config)
+        if self.service:
+            self.service.update_config(config)
         self.video_id = config.get("youtube_video_id", "")
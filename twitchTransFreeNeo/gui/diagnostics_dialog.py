@@ -3,6 +3,7 @@
 
 import flet as ft
 from typing import Dict, Any
+import os
 import socket
 import time
 import platform
@@ -196,19 +197,26 @@ class DiagnosticsDialog:
             return {"status": "WARNING", "message": "aiohttpが利用できないため、DeepLテストをスキップしました"}
 
         try:
-            url = "https://api-free.deepl.com/v2/usage"
-            headers = {"Authorization": f"DeepL-Auth-Key {api_key}"}
+            from ..core.http_client import HTTPClient
+            from ..core.deepl_client import DeepLClient, DeepLAuthorizationError
+        except ImportError:
+            from twitchTransFreeNeo.core.http_client import HTTPClient
+            from twitchTransFreeNeo.core.deepl_client import DeepLClient, DeepLAuthorizationError
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                    if response.status == 200:
-                        return {"status": "OK", "message": "DeepL API接続: 正常"}
-                    elif response.status == 403:
-                        return {"status": "ERROR", "message": "DeepL API接続: 認証エラー (APIキーを確認してください)"}
-                    else:
-                        return {"status": "ERROR", "message": f"DeepL API接続: エラー (Status: {response.status})"}
+        http = HTTPClient(timeout_seconds=5)
+        try:
+            usage = await DeepLClient(api_key, http).get_usage()
+            count, limit = usage['character_count'], usage['character_limit']
+            if count is not None and limit:
+                return {"status": "OK",
+                        "message": f"DeepL API接続: 正常 (今月の利用 {count:,}/{limit:,}文字, {count / limit:.0%})"}
+            return {"status": "OK", "message": "DeepL API接続: 正常"}
+        except DeepLAuthorizationError:
+            return {"status": "ERROR", "message": "DeepL API接続: 認証エラー (APIキーを確認してください)"}
         except Exception as e:
             return {"status": "ERROR", "message": f"DeepL API接続: エラー ({str(e)})"}
+        finally:
+            await http.close()
 
     def _create_summary(self):
         """診断結果のサマリーを作成"""
@@ -293,6 +301,15 @@ class DiagnosticsDialog:
         report.append(f"  {status} {translator['message']}")
         report.append("")
 
+        # 翻訳キャッシュ
+        report.append("[翻訳キャッシュ]")
+        cache = self.results["cache_check"]
+        status = "✓" if cache["status"] == "OK" else ("○" if cache["status"] == "SKIP" else "✗")
+        report.append(f"  {status} {cache['message']}")
+        for line in cache.get("details", []):
+            report.append(f"    {line}")
+        report.append("")
+
         # サマリー
         report.append("[診断結果サマリー]")
         summary = self.results["summary"]
@@ -317,6 +334,95 @@ class DiagnosticsDialog:
 
         return "\n".join(report)
 
+    async def _check_translation_cache(self) -> Dict[str, Any]:
+        """翻訳キャッシュの状態（集計テーブル参照のため件数によらず一定時間）"""
+        try:
+            from ..core.translation_service import TranslationService
+            from ..core.database import TranslationDatabase
+        except ImportError:
+            from twitchTransFreeNeo.core.translation_service import TranslationService
+            from twitchTransFreeNeo.core.database import TranslationDatabase
+
+        try:
+            service = TranslationService.current()
+            if service:
+                stats = await service.submit(service.database.get_statistics())
+            elif os.path.exists("translations.db"):
+                database = TranslationDatabase()
+                try:
+                    stats = await database.get_statistics()
+                finally:
+                    await database.close()
+            else:
+                return {"status": "SKIP", "message": "翻訳キャッシュはまだ作成されていません"}
+
+            details = [
+                f"{item['lang']}: {item['count']}件" for item in stats["language_stats"][:5]
+            ]
+            memory = stats.get("memory_cache", {})
+            if service and memory:
+                details.append(
+                    f"メモリキャッシュ: {memory['entries']}件 / ヒット率 {memory['hit_rate'] * 100:.1f}%"
+                )
+            keys = stats.get("key_normalization", {})
+            if service and keys.get("lookups"):
+                details.append(
+                    f"キーの正規化によるヒット率の向上: +{keys['hit_rate_gain'] * 100:.1f}%"
+                    f"（全体 {keys['hit_rate'] * 100:.1f}% / 表記ゆれでヒット {keys['normalized_hits']}件）"
+                )
+            fuzzy = stats.get("fuzzy_match", {})
+            if service and fuzzy.get("enabled"):
+                details.append(
+                    f"あいまい検索: 一致 {fuzzy['hits']}件 / 検索 {fuzzy['lookups']}件"
+                    f"（平均候補数 {fuzzy['average_candidates']}件"
+                    f"{' / 索引を作成中' if fuzzy['backfill_pending'] else ''}）"
+                )
+            if service:
+                local = service.get_local_stats()
+                details.append(
+                    f"省いたリモート呼び出し: {local['remote_calls_saved']}件"
+                    f"（母語判定 {local['home_fast_path']}件 / ローカル言語識別 {local['local_detections']}件"
+                    f" / 同時リクエストの共有 {local['coalesced']}件）"
+                )
+                segments = service.get_segment_stats()
+                if segments['messages']:
+                    details.append(
+                        f"文ごとのキャッシュ: {segments['hits']}/{segments['lookups']}文がヒット"
+                        f"（{segments['messages']}メッセージ / 省いた翻訳 {segments['chars_saved']}文字）"
+                    )
+                hedge = service.get_hedge_stats()
+                if hedge['answered']:
+                    answered = " / ".join(f"{engine} {n}件" for engine, n in sorted(hedge['answered'].items()))
+                    details.append(
+                        f"応答したエンジン: {answered}（ヘッジ送信 {hedge['hedged']}回 / 後発が先着"
+                        f" {hedge['hedge_wins']}件 / 時間切れ {hedge['budget_exceeded']}件）"
+                    )
+                pool = service.get_executor_stats()
+                details.append(
+                    f"翻訳スレッド: 実行中 {pool['busy']}/{pool['max_workers']} / 待機中 {pool['queue_depth']}件"
+                    f"（最大 {pool['max_queue_depth']}件） / 完了 {pool['completed']}件"
+                )
+                health = service.get_engine_health()
+                state_names = {"closed": "正常", "open": "停止中", "half_open": "回復確認中", "disabled": "無効"}
+                for engine, limit in service.get_rate_limit_stats().items():
+                    if limit['requests'] or limit['queue_depth']:
+                        engine_health = health[engine]
+                        latency = engine_health['latency_ms']
+                        details.append(
+                            f"{engine}: {state_names[engine_health['state']]}"
+                            f" / 平均応答 {f'{latency}ms' if latency is not None else '-'}"
+                            f" / 送信 {limit['requests']}件 / 待機中 {limit['queue_depth']}件"
+                            f"（最大 {limit['max_queue_depth']}件） / 制限 {limit['throttle_events']}回"
+                            f" / 現在のレート {limit['rate_per_second']}件/秒"
+                        )
+            return {
+                "status": "OK",
+                "message": f"翻訳キャッシュ: {stats['total_translations']}件 ({stats['database_size_mb']}MB)",
+                "details": details,
+            }
+        except Exception as e:
+            return {"status": "ERROR", "message": f"翻訳キャッシュ: 取得エラー ({str(e)})"}
+
     async def _run_diagnostics(self):
         """診断を実行"""
         try:
@@ -333,6 +439,7 @@ class DiagnosticsDialog:
                 "network_check": await self._check_network(),
                 "twitch_check": await self._check_twitch_connection(),
                 "translator_check": await self._check_translator(),
+                "cache_check": await self._check_translation_cache(),
             }
 
             # サマリー作成
@@ -105,8 +105,63 @@ class ConfigManager:
             # 翻訳エンジン設定
             "translator": "google",  # google, deepl
             "gas_url": "",
+            "gas_batch": False,  # GASスクリプトが配列の一括翻訳に対応している場合のみTrue
+            "single_pass_translation": False,  # 言語検出を省き、翻訳結果から翻訳元言語を得る
+            "local_langid_enabled": True,  # 同梱プロファイルによるオフライン言語識別を使う
+            "local_langid_threshold": 0.8,  # この確信度未満ならリモートの言語検出を使う
+            "home_fast_path": True,  # 母語を翻訳しない設定のとき、明らかな母語の投稿を通信せずに除外
+            "home_fast_path_confidence": 0.95,  # 母語と判定する確信度（仮名を含む→ja などは1.0）
             "google_translate_suffix": "co.jp",
             
+            # 翻訳キャッシュ設定
+            "translation_cache_max_entries": 5000,  # インメモリLRUの最大件数
+            "translation_cache_max_bytes": 4194304,  # インメモリLRUの最大サイズ（4MB, 0=無制限）
+            "translation_cache_flush_interval_ms": 500,  # 翻訳の書き込みをまとめる間隔
+            "translation_cache_flush_max_rows": 50,  # この件数に達したら即座に書き込む
+            "translation_cache_keep_days": 30,  # この日数使われていない翻訳をアイドル時に削除（0=削除しない）
+            "translation_cache_idle_seconds": 60,  # この秒数チャットが途切れたらアイドルとみなす
+            "translation_negative_cache_max_entries": 10000,  # 翻訳不要と判定したメッセージの記録件数
+            "translation_negative_cache_ttl_seconds": 600,  # 翻訳不要の判定を覚えておく秒数
+            # 翻訳キャッシュのキーの正規化（変更すると次回起動時にバックグラウンドでキーを再計算する）
+            "translation_cache_key_nfkc": True,  # 全角・半角の違いを同一視する
+            "translation_cache_key_casefold": True,  # 大文字・小文字の違いを同一視する
+            "translation_cache_key_collapse_repeats": 3,  # 同じ文字がこの回数以上続く部分を1文字として扱う（0=無効）
+            "translation_cache_key_trim_punctuation": True,  # 前後の句読点（!!! など）を無視する
+            # 翻訳メモリのあいまい検索（1単語違いのコピペなど、似たメッセージの翻訳を使う）
+            "translation_fuzzy_match": False,  # キーが一致しない場合に似たメッセージの翻訳を探す（別のメッセージの翻訳が表示されうる）
+            "translation_fuzzy_langs": [],  # あいまい検索を使う翻訳先言語（空=すべての言語）
+            "translation_fuzzy_threshold": 0.8,  # 文字3-gramの類似度（Jaccard係数）がこれ以上なら一致とみなす
+            "translation_fuzzy_max_edits": 2,  # 編集距離（文字の追加・削除・置換の回数）がこれ以下でも一致とみなす（0=無効）
+            "translation_fuzzy_min_length": 20,  # これより短いメッセージはあいまい検索しない（10未満は10として扱う）
+            # 長いメッセージを文ごとに分け、キャッシュにない文だけを翻訳する（文の前後の文脈は翻訳に使われなくなる）
+            "translation_segment_cache": False,  # 文ごとのキャッシュを使う
+            "translation_segment_clauses": False,  # 文末に加えてカンマ・読点でも分ける
+            "translation_segment_min_length": 30,  # これより短いメッセージは分けずに翻訳する
+
+            # HTTP接続設定
+            "http_pool_size": 10,  # 翻訳APIへの同時接続数の上限
+            "http_dns_cache_seconds": 300,  # DNS解決結果のキャッシュ秒数
+            "translation_batch_window_ms": 20,  # 翻訳をまとめて送るまでの待ち時間（DeepL・gas_batch有効時のGASのみ、0=まとめない）
+            "translation_batch_max_items": 16,  # 1回にまとめる最大件数
+            "translation_executor_workers": 4,  # 翻訳・言語検出ライブラリの呼び出しに使うスレッド数
+
+            # 翻訳エンジンごとの送信制限（429・5xx応答を受けると自動でレートを下げる）
+            "google_max_concurrency": 4,  # Google翻訳への同時リクエスト数
+            "google_rate_per_second": 5.0,  # Google翻訳への送信レートの初期値（件/秒、制限されるまでは引き上げる）
+            "deepl_max_concurrency": 2,  # DeepLへの同時リクエスト数
+            "deepl_rate_per_second": 5.0,  # DeepLへの送信レートの初期値（件/秒、制限されるまでは引き上げる）
+            "gas_max_concurrency": 4,  # GASへの同時リクエスト数
+            "gas_rate_per_second": 5.0,  # GASへの送信レートの初期値（件/秒、制限されるまでは引き上げる）
+            "translation_throttle_retries": 3,  # 送信が制限されたときに待って再試行する回数
+            "engine_failure_threshold": 5,  # この回数続けて失敗したエンジンへの送信を一時停止
+            "engine_slow_seconds": 5.0,  # 平均応答時間がこの秒数を超えたエンジンへの送信を一時停止（0=判定しない）
+            "engine_open_seconds": 30,  # 一時停止してから回復を確認するまでの秒数
+            "engine_latency_routing": False,  # 設定したエンジンより応答の速いエンジンへ振り分ける（True=有効）
+            "engine_latency_factor": 2.0,  # 優先エンジンの平均応答時間が最速の何倍を超えたら振り分けるか
+            "translation_latency_budget_ms": 6000,  # この時間内に返らなかった翻訳は破棄する（0=待ち続ける）
+            "translation_hedge_enabled": True,  # 優先エンジンの応答が遅い場合に次のエンジンへも送る
+            "translation_hedge_delay_ms": 1500,  # 応答時間の計測が少ないうちにヘッジを送るまでの時間
+
             # フィルタリング設定
             "ignore_lang": [],
             "ignore_users": ["Nightbot", "BikuBikuTest"],